@@ -2,6 +2,7 @@
 
 from crewai import Agent, LLM
 
+from app.compaction import CompactionReport
 from app.tools.github_tool import GitHubAnalysisTool
 from app.tools.pptx_tool import PPTXAnalysisTool
 from app.tools.video_tool import VideoAnalysisTool
@@ -9,7 +10,7 @@ from app.tools.video_tool import VideoAnalysisTool
 CLAUDE_LLM = LLM(model="anthropic/claude-sonnet-4-20250514", temperature=0.3)
 
 
-def create_github_agent() -> Agent:
+def create_github_agent(compaction: CompactionReport | None = None) -> Agent:
     return Agent(
         role="Senior Code Reviewer & Architecture Analyst",
         goal=(
@@ -26,13 +27,13 @@ def create_github_agent() -> Agent:
             "implements what the team claims."
         ),
         llm=CLAUDE_LLM,
-        tools=[GitHubAnalysisTool()],
+        tools=[GitHubAnalysisTool(compaction=compaction)],
         verbose=True,
         max_iter=15,
     )
 
 
-def create_ppt_agent() -> Agent:
+def create_ppt_agent(compaction: CompactionReport | None = None) -> Agent:
     return Agent(
         role="Business Strategy & Pitch Deck Analyst",
         goal=(
@@ -49,7 +50,7 @@ def create_ppt_agent() -> Agent:
             "narrative flow."
         ),
         llm=CLAUDE_LLM,
-        tools=[PPTXAnalysisTool()],
+        tools=[PPTXAnalysisTool(compaction=compaction)],
         verbose=True,
         max_iter=15,
     )
@@ -77,7 +78,7 @@ def create_voice_agent() -> Agent:
     )
 
 
-def create_video_agent() -> Agent:
+def create_video_agent(compaction: CompactionReport | None = None) -> Agent:
     return Agent(
         role="Product Demo & UX Analyst",
         goal=(
@@ -94,7 +95,7 @@ def create_video_agent() -> Agent:
             "the demo matches what was promised in the pitch."
         ),
         llm=CLAUDE_LLM,
-        tools=[VideoAnalysisTool()],
+        tools=[VideoAnalysisTool(compaction=compaction)],
         verbose=True,
         max_iter=15,
     )
@@ -0,0 +1,224 @@
+"""Token-budgeted compaction of tool outputs and transcripts before they reach an agent.
+
+Text within its agent's budget passes through untouched. Over budget it is
+compacted in stages, stopping as soon as it fits:
+
+1. long prose lines (transcripts usually arrive as one) are split into
+   sentences, repeated boilerplate lines and sentences (footers, table
+   headers on every slide, filler) are kept once, and blank runs collapse;
+2. long tables keep their first rows and last row, with a count of the rest;
+3. lines are ranked by signal — headings and slide titles, then labels and
+   lines with numbers or claim vocabulary, then everything else — and the best lines
+   that fit are kept in their original order, with omission markers.
+
+Token counts are estimates (about four characters per token), good enough
+for budgeting and reporting without a tokenizer dependency.
+"""
+
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+COMPACTION_ENABLED = os.getenv("JUDGE_COMPACTION", "true").lower() not in ("0", "false", "no")
+CHARS_PER_TOKEN = 4
+TOKEN_BUDGETS = {
+    "github": int(os.getenv("JUDGE_TOKEN_BUDGET_GITHUB", "6000")),
+    "ppt": int(os.getenv("JUDGE_TOKEN_BUDGET_PPT", "6000")),
+    "voice": int(os.getenv("JUDGE_TOKEN_BUDGET_VOICE", "4000")),
+    "video": int(os.getenv("JUDGE_TOKEN_BUDGET_VIDEO", "4000")),
+}
+# Tables longer than this keep this many leading rows plus their last row.
+TABLE_KEEP_ROWS = int(os.getenv("JUDGE_COMPACTION_TABLE_ROWS", "4"))
+# Shorter repeated lines ("Table:", "---") are structure, not boilerplate.
+DEDUPE_MIN_CHARS = 12
+# Lines longer than this are treated as prose and split into sentences.
+SENTENCE_SPLIT_CHARS = 300
+
+_HEADING = re.compile(r"^\s*(#{1,6}\s|\*\*Title:\*\*)")
+# Labels such as "Table:" or "Per-author churn:" introduce the lines below them.
+_LABEL = re.compile(r"^\s*[A-Z][\w ()/&-]{0,60}:\s*$")
+_TABLE_ROW = re.compile(r"^\s*(Row \d+:|\|.*\|\s*$)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_NUMBER = re.compile(r"\d")
+_CLAIM = re.compile(
+    r"\b(users?|customers?|clients?|revenue|ARR|MRR|growth|grew|market|TAM|SAM|SOM|traction|accuracy|"
+    r"latency|faster|million|billion|percent|partners?(hip)?|patent\w*|launch\w*|pilots?|waitlist|"
+    r"downloads?|raised|funding|investors?|compliant|compliance|HIPAA|GDPR|SOC ?2|secure|encrypt\w*|"
+    r"scal\w+|real-time|deadline|mega-commits?|authors?)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _signal(line: str) -> int:
+    if _HEADING.match(line):
+        return 3
+    if _LABEL.match(line) or _NUMBER.search(line) or _CLAIM.search(line):
+        return 2
+    return 1
+
+
+def _split_prose(lines: list[str]) -> list[str]:
+    out: list[str] = []
+    for line in lines:
+        # Leave structured lines (inline JSON, tables) whole.
+        if len(line) > SENTENCE_SPLIT_CHARS and not line.lstrip().startswith(("{", "[", "|")):
+            out.extend(_SENTENCE_END.split(line))
+        else:
+            out.append(line)
+    return out
+
+
+def _dedupe(lines: list[str]) -> list[str]:
+    seen: set[str] = set()
+    out: list[str] = []
+    for line in lines:
+        key = " ".join(line.split()).lower()
+        if not key:
+            if out and not out[-1].strip():
+                continue
+        elif len(key) >= DEDUPE_MIN_CHARS and not _HEADING.match(line) and not _LABEL.match(line):
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(line)
+    return out
+
+
+def _collapse_tables(lines: list[str], keep: int = TABLE_KEEP_ROWS) -> list[str]:
+    out: list[str] = []
+    i = 0
+    while i < len(lines):
+        j = i
+        while j < len(lines) and _TABLE_ROW.match(lines[j]):
+            j += 1
+        run = lines[i:j]
+        if len(run) > keep + 1:
+            indent = run[0][: len(run[0]) - len(run[0].lstrip())]
+            out.extend(run[:keep])
+            out.append(f"{indent}... {len(run) - keep - 1} more rows")
+            out.append(run[-1])
+        else:
+            out.extend(run)
+        if j == i:
+            out.append(lines[i])
+            j += 1
+        i = j
+    return out
+
+
+def _assemble(lines: list[str], kept: set[int]) -> str:
+    out: list[str] = []
+    gap = 0
+    for i, line in enumerate(lines):
+        if i in kept:
+            if gap:
+                out.append(f"[... {gap} lines omitted ...]")
+                gap = 0
+            out.append(line)
+        elif line.strip():
+            gap += 1
+    if gap:
+        out.append(f"[... {gap} lines omitted ...]")
+    return "\n".join(out)
+
+
+def _select(lines: list[str], budget: int) -> str:
+    # A single huge line (minified JSON, a pasted file) may not eat the whole budget.
+    max_chars = max(80, budget * CHARS_PER_TOKEN // 4)
+    lines = [line if len(line) <= max_chars else line[:max_chars] + " …" for line in lines]
+    ranked = sorted((i for i, line in enumerate(lines) if line.strip()), key=lambda i: (-_signal(lines[i]), i))
+
+    # Leave room for omission markers, then trim further if they still overflow.
+    allowance = budget - max(16, budget // 10)
+    kept: list[int] = []
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(lines[i]) + 1
+        if used + cost <= allowance:
+            kept.append(i)
+            used += cost
+    text = _assemble(lines, set(kept))
+    while kept and estimate_tokens(text) > budget:
+        del kept[-max(1, len(kept) // 20):]
+        text = _assemble(lines, set(kept))
+    return text
+
+
+def compact(text: str, budget: int) -> str:
+    """Return ``text`` reduced to roughly ``budget`` tokens, keeping its high-signal lines."""
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = _dedupe(_split_prose(text.splitlines()))
+    deduped = "\n".join(lines)
+    if estimate_tokens(deduped) <= budget:
+        return deduped
+    lines = _collapse_tables(lines)
+    collapsed = "\n".join(lines)
+    if estimate_tokens(collapsed) <= budget:
+        return collapsed
+    return _select(lines, budget)
+
+
+@dataclass(frozen=True)
+class CompactionEntry:
+    agent: str
+    source: str
+    tokens_before: int
+    tokens_after: int
+    budget: int
+
+
+def summarize(entries: list[dict]) -> dict:
+    """Job-level totals over entries (dicts as produced by ``asdict(CompactionEntry)``)."""
+    before = sum(e["tokens_before"] for e in entries)
+    after = sum(e["tokens_after"] for e in entries)
+    return {
+        "tokens_before": before,
+        "tokens_after": after,
+        "tokens_saved": before - after,
+        "compaction_ratio": round(after / before, 3) if before else 1.0,
+        "sources": entries,
+    }
+
+
+class CompactionReport:
+    """Compacts inputs for one crew run and keeps a record of what was saved.
+
+    ``on_record`` is called as ``on_record(entry, totals)`` after each
+    compaction, from whichever thread ran the tool.
+    """
+
+    def __init__(self, budgets: dict[str, int] | None = None, on_record: Callable[[dict, dict], None] | None = None):
+        self.budgets = budgets or TOKEN_BUDGETS
+        self.on_record = on_record
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], dict] = {}
+
+    def compact(self, agent_key: str, source: str, text: str) -> str:
+        budget = self.budgets.get(agent_key)
+        if not COMPACTION_ENABLED or not budget or not text:
+            return text
+        compacted = compact(text, budget)
+        entry = asdict(CompactionEntry(agent_key, source, estimate_tokens(text), estimate_tokens(compacted), budget))
+        with self._lock:
+            # A tool called twice on the same input is one source, not two.
+            self._entries[(agent_key, source)] = entry
+            totals = summarize(list(self._entries.values()))
+        if self.on_record:
+            self.on_record(entry, totals)
+        return compacted
+
+    def summary(self) -> dict:
+        with self._lock:
+            return summarize(list(self._entries.values()))
+
+
+def compact_for(agent_key: str, source: str, text: str, report: CompactionReport | None = None) -> str:
+    """Compact ``text`` to ``agent_key``'s budget, recording it on ``report`` if given."""
+    return (report or CompactionReport()).compact(agent_key, source, text)
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Any, Callable
 
 from crewai import Crew, Process, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
 
 from app.agents.definitions import (
     create_github_agent,
@@ -14,10 +16,53 @@ from app.agents.definitions import (
     create_video_agent,
     create_voice_agent,
 )
-from app.models.schemas import JudgingResult
+from app.compaction import CompactionReport
+from app.models.schemas import AgentAnalysis, JudgingResult, VerdictDraft
 
 RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
 
+# Witness tasks never read each other's output, so by default they fan out and
+# run concurrently; only the orchestrator waits on all four via `context`.
+PARALLEL_WITNESSES = os.getenv("JUDGE_PARALLEL_WITNESSES", "true").lower() not in ("0", "false", "no")
+
+WITNESS_KEYS = ("github", "ppt", "voice", "video")
+
+# Witnesses that can be skipped outright: (input they need, concern recorded when it's missing).
+_OPTIONAL_INPUTS = {
+    "ppt": ("pitch deck", "No pitch deck was submitted; business claims rest on the transcript alone."),
+    "video": ("demo video", "No demo video was submitted; product functionality could not be verified."),
+}
+
+
+def skipped_agents(pptx_path: str | None, video_path: str | None) -> list[str]:
+    """Witnesses with nothing to analyze; they get a placeholder digest instead of an LLM call."""
+    inputs = {"ppt": pptx_path, "video": video_path}
+    return [key for key, path in inputs.items() if not (path and os.path.exists(path))]
+
+
+def placeholder_analysis(agent_key: str) -> AgentAnalysis:
+    """Deterministic digest standing in for a skipped witness."""
+    what, concern = _OPTIONAL_INPUTS[agent_key]
+    return AgentAnalysis(
+        summary=f"Skipped: no {what} was provided.",
+        key_findings=[],
+        concerns=[concern],
+        strengths=[],
+    )
+
+
+def _digest_format(claims: str) -> str:
+    """Expected output shared by the witnesses: an AgentAnalysis digest for the Chief Judge."""
+    return (
+        "A compact JSON digest (AgentAnalysis) that the Chief Judge reads instead of your full notes:\n"
+        '{"summary": "<2-3 sentences>", '
+        '"key_findings": ["<up to 8 findings, each citing concrete evidence>"], '
+        '"strengths": ["<strength>"], "concerns": ["<concern>"], '
+        f'"claims": ["<{claims}>"], '
+        '"raw_detail": ""}\n'
+        "Be specific and terse; leave raw_detail empty."
+    )
+
 
 def _build_tasks(
     team_name: str,
@@ -26,8 +71,18 @@ def _build_tasks(
     video_path: str | None,
     transcript: str,
     agents: dict,
+    parallel: bool = PARALLEL_WITNESSES,
+    compaction: CompactionReport | None = None,
 ) -> dict:
-    """Build all 5 task objects. Returns dict keyed by agent name."""
+    """Build all 5 task objects. Returns dict keyed by agent name.
+
+    With ``parallel`` the four witness tasks are marked ``async_execution`` so
+    CrewAI runs them side by side and joins them before the orchestrator.
+    Each task is named after its agent key so callbacks can attribute outputs.
+    Tasks for witnesses in ``skipped_agents`` are built but never run.
+    The transcript is compacted to the voice agent's token budget.
+    """
+    transcript = (compaction or CompactionReport()).compact("voice", "transcript", transcript)
 
     github_task = Task(
         description=(
@@ -36,34 +91,29 @@ def _build_tasks(
             "Then provide a thorough evaluation covering:\n"
             "1. Code quality and architecture\n"
             "2. Tech stack identification\n"
-            "3. Commit history patterns (frequency, authors, meaningful messages vs. bulk commits)\n"
+            "3. Commit history patterns (frequency, authors, meaningful messages vs. bulk commits) — "
+            "cite the structured commit analytics (commits_per_day, authors, mega_commits, "
+            "commits_after_deadline)\n"
             "4. Project structure and organization\n"
             "5. Testing and CI/CD presence\n"
             "6. Documentation quality\n"
             "7. Any red flags (e.g., single mega-commit, copied boilerplate, no real logic)\n\n"
             "Be specific — cite file names, line counts, and exact findings."
         ),
-        expected_output=(
-            "A structured analysis with sections: Summary, Key Findings (list), "
-            "Strengths (list), Concerns (list), and a detailed narrative covering "
-            "code quality, architecture, tech stack, commit history, and red flags."
+        expected_output=_digest_format(
+            "implementation facts to test claims against: features actually built, integrations, "
+            "tech stack, commit timeline — cite files and commit analytics fields"
         ),
         agent=agents["github"],
+        name="github",
+        output_pydantic=AgentAnalysis,
+        async_execution=parallel,
     )
 
-    ppt_description = f"Analyze the pitch deck for team '{team_name}'.\n\n"
-    if pptx_path and os.path.exists(pptx_path):
-        ppt_description += (
-            f"Use the PowerPoint Analyzer tool with file_path: {pptx_path}\n\n"
-            "Then evaluate:\n"
-        )
-    else:
-        ppt_description += (
-            "NOTE: No PowerPoint file was provided. Analyze based solely on the "
-            "voice transcript and any references to slides. State that no deck was available.\n\n"
-            "Evaluate what you can infer:\n"
-        )
-    ppt_description += (
+    ppt_description = (
+        f"Analyze the pitch deck for team '{team_name}'.\n\n"
+        f"Use the PowerPoint Analyzer tool with file_path: {pptx_path}\n\n"
+        "Then evaluate:\n"
         "1. Business model clarity and viability\n"
         "2. Problem-solution fit\n"
         "3. Market analysis and competitive positioning\n"
@@ -76,12 +126,11 @@ def _build_tasks(
 
     ppt_task = Task(
         description=ppt_description,
-        expected_output=(
-            "A structured analysis with sections: Summary, Key Findings (list), "
-            "Strengths (list), Concerns (list), Specific Claims Extracted (list of "
-            "exact claims with slide numbers if available), and overall business viability assessment."
-        ),
+        expected_output=_digest_format("every specific claim made in the deck, with its slide number"),
         agent=agents["ppt"],
+        name="ppt",
+        output_pydantic=AgentAnalysis,
+        async_execution=parallel,
     )
 
     voice_task = Task(
@@ -98,40 +147,32 @@ def _build_tasks(
             "7. Any contradictions or vague handwaving\n\n"
             "Extract every specific verbal claim for cross-referencing."
         ),
-        expected_output=(
-            "A structured analysis with sections: Summary, Key Findings (list), "
-            "Strengths (list), Concerns (list), Specific Verbal Claims (list), "
-            "and communication quality assessment."
-        ),
+        expected_output=_digest_format("every specific verbal claim: numbers, features, partnerships, traction"),
         agent=agents["voice"],
+        name="voice",
+        output_pydantic=AgentAnalysis,
+        async_execution=parallel,
     )
 
-    video_description = f"Analyze the demo video for team '{team_name}'.\n\n"
-    if video_path and os.path.exists(video_path):
-        video_description += (
-            f"Use the Demo Video Analyzer tool with file_path: {video_path}\n\n"
-            "Then provide your expert evaluation of the demo."
-        )
-    else:
-        video_description += (
-            "NOTE: No video file was provided. State that no demo video was available "
-            "for analysis and note this as a gap in the evaluation."
-        )
+    video_description = (
+        f"Analyze the demo video for team '{team_name}'.\n\n"
+        f"Use the Demo Video Analyzer tool with file_path: {video_path}\n\n"
+        "Then provide your expert evaluation of the demo."
+    )
 
     video_task = Task(
         description=video_description,
-        expected_output=(
-            "A structured analysis with sections: Summary, Key Findings (list), "
-            "Features Demonstrated (list), Strengths (list), Concerns (list), "
-            "and authenticity/polish assessment."
-        ),
+        expected_output=_digest_format("every feature demonstrated, noting whether it looked live or staged"),
         agent=agents["video"],
+        name="video",
+        output_pydantic=AgentAnalysis,
+        async_execution=parallel,
     )
 
     orchestrator_task = Task(
         description=(
-            f"You are the Chief Judge for team '{team_name}'. You have received detailed "
-            "analyses from four specialized agents:\n"
+            f"You are the Chief Judge for team '{team_name}'. You have received structured "
+            "digests (summary, key_findings, strengths, concerns, claims) from four specialized agents:\n"
             "1. GitHub Agent (code & architecture)\n"
             "2. PPT Agent (pitch deck & business model)\n"
             "3. Voice Agent (transcript & communication)\n"
@@ -158,7 +199,8 @@ def _build_tasks(
             "Write a 60-second script that an AI judge could read aloud to the team, "
             "covering the top 3-4 questions in a professional, encouraging but probing tone.\n\n"
             "## E) Final Summary\n"
-            "List the top 5 strengths and top 5 concerns."
+            "List the top 5 strengths and top 5 concerns.\n\n"
+            "Do not restate the agents' digests; they are attached to the result separately."
         ),
         expected_output=(
             'Respond with a valid JSON object matching this exact structure:\n'
@@ -183,16 +225,13 @@ def _build_tasks(
             '  ],\n'
             '  "key_strengths": ["<strength 1>", ...],\n'
             '  "key_concerns": ["<concern 1>", ...],\n'
-            '  "voice_script": "<60-second script for AI judge>",\n'
-            '  "github_analysis": {"summary": "...", "key_findings": [...], "concerns": [...], "strengths": [...]},\n'
-            '  "ppt_analysis": {"summary": "...", "key_findings": [...], "concerns": [...], "strengths": [...]},\n'
-            '  "voice_analysis": {"summary": "...", "key_findings": [...], "concerns": [...], "strengths": [...]},\n'
-            '  "video_analysis": {"summary": "...", "key_findings": [...], "concerns": [...], "strengths": [...]}\n'
+            '  "voice_script": "<60-second script for AI judge>"\n'
             '}\n'
         ),
         agent=agents["orchestrator"],
+        name="orchestrator",
         context=[github_task, ppt_task, voice_task, video_task],
-        output_json=JudgingResult,
+        output_json=VerdictDraft,
     )
 
     return {
@@ -204,31 +243,110 @@ def _build_tasks(
     }
 
 
-def _parse_result(result: Any, team_name: str) -> JudgingResult:
-    """Save result to disk and parse into JudgingResult."""
+def _create_agents(compaction: CompactionReport | None = None) -> dict:
+    return {
+        "github": create_github_agent(compaction),
+        "ppt": create_ppt_agent(compaction),
+        "voice": create_voice_agent(),
+        "video": create_video_agent(compaction),
+        "orchestrator": create_orchestrator_agent(),
+    }
+
+
+def _settled_outputs(
+    pptx_path: str | None, video_path: str | None, completed_outputs: dict[str, str] | None = None
+) -> dict[str, str]:
+    """Checkpointed outputs plus placeholder digests for witnesses with no input."""
+    outputs = dict(completed_outputs or {})
+    for key in skipped_agents(pptx_path, video_path):
+        outputs.setdefault(key, placeholder_analysis(key).model_dump_json())
+    return outputs
+
+
+def _apply_checkpoints(tasks: dict, completed_outputs: dict[str, str] | None) -> list:
+    """Attach cached outputs to finished tasks and return the ones still to run.
+
+    The orchestrator reads its context from each context task's ``output``, so
+    a checkpointed witness is left out of the crew but still feeds the verdict.
+    """
+    completed_outputs = completed_outputs or {}
+    pending = []
+    for key, task in tasks.items():
+        raw = completed_outputs.get(key)
+        if raw is None:
+            pending.append(task)
+            continue
+        task.output = TaskOutput(
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=raw,
+            agent=task.agent.role,
+            name=key,
+        )
+    return pending
+
+
+def _analysis_from_output(output: TaskOutput) -> AgentAnalysis:
+    """A witness's digest, parsed from its raw output when CrewAI didn't convert it (e.g. a checkpoint)."""
+    if isinstance(output.pydantic, AgentAnalysis):
+        return output.pydantic
+    raw = output.raw.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`").removeprefix("json").strip()
+    try:
+        return AgentAnalysis.model_validate_json(raw)
+    except ValueError:
+        return AgentAnalysis(
+            summary=output.raw[:500],
+            key_findings=[],
+            concerns=[],
+            strengths=[],
+            raw_detail=output.raw,
+        )
+
+
+def _witness_analyses(tasks: dict) -> dict[str, AgentAnalysis]:
+    """``{"<key>_analysis": digest}`` for every witness task that produced output."""
+    return {
+        f"{key}_analysis": _analysis_from_output(tasks[key].output)
+        for key in WITNESS_KEYS
+        if tasks[key].output is not None
+    }
+
+
+def _parse_result(result: Any, team_name: str, analyses: dict[str, AgentAnalysis] | None = None) -> JudgingResult:
+    """Save result to disk and parse into JudgingResult.
+
+    The orchestrator only drafts the verdict (``VerdictDraft``); ``analyses``
+    are the witnesses' own digests and fill the ``*_analysis`` fields.
+    """
     os.makedirs(RESULTS_DIR, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in team_name)
     result_file = os.path.join(RESULTS_DIR, f"{safe_name}_{timestamp}.json")
+    analyses = analyses or {}
 
     raw_output = result.raw if hasattr(result, "raw") else str(result)
     try:
         parsed = json.loads(raw_output)
     except (json.JSONDecodeError, TypeError):
         parsed = {"raw_output": raw_output}
+    if isinstance(parsed, dict):
+        parsed = {key: value for key, value in parsed.items() if not key.endswith("_analysis")}
+        parsed.update({field: analysis.model_dump() for field, analysis in analyses.items()})
 
     with open(result_file, "w", encoding="utf-8") as f:
         json.dump(parsed, f, indent=2, ensure_ascii=False)
 
     if result.pydantic:
-        return result.pydantic
+        draft = result.pydantic
     elif result.json_dict:
-        return JudgingResult(**result.json_dict)
+        draft = VerdictDraft(**result.json_dict)
     else:
         try:
-            return JudgingResult(**json.loads(raw_output))
+            draft = VerdictDraft(**json.loads(raw_output))
         except Exception:
-            return JudgingResult(
+            draft = VerdictDraft(
                 team_name=team_name,
                 scores={"technical": 0, "business": 0, "presentation": 0, "demo_quality": 0, "innovation": 0, "overall": 0},
                 questions=[],
@@ -236,6 +354,7 @@ def _parse_result(result: Any, team_name: str) -> JudgingResult:
                 key_concerns=["Structured parsing failed — review raw JSON file"],
                 voice_script="The analysis has been completed. Please review the detailed results file.",
             )
+    return JudgingResult(**draft.model_dump(), **analyses)
 
 
 def build_and_run_crew(
@@ -244,26 +363,23 @@ def build_and_run_crew(
     pptx_path: str | None,
     video_path: str | None,
     transcript: str,
+    parallel: bool = PARALLEL_WITNESSES,
 ) -> JudgingResult:
     """Assemble the full judging crew and execute synchronously (original API)."""
-    agents = {
-        "github": create_github_agent(),
-        "ppt": create_ppt_agent(),
-        "voice": create_voice_agent(),
-        "video": create_video_agent(),
-        "orchestrator": create_orchestrator_agent(),
-    }
-    tasks = _build_tasks(team_name, github_url, pptx_path, video_path, transcript, agents)
+    compaction = CompactionReport()
+    agents = _create_agents(compaction)
+    tasks = _build_tasks(team_name, github_url, pptx_path, video_path, transcript, agents, parallel, compaction)
+    pending = _apply_checkpoints(tasks, _settled_outputs(pptx_path, video_path))
 
     crew = Crew(
-        agents=list(agents.values()),
-        tasks=list(tasks.values()),
+        agents=[task.agent for task in pending],
+        tasks=pending,
         process=Process.sequential,
         verbose=True,
     )
 
     result = crew.kickoff()
-    return _parse_result(result, team_name)
+    return _parse_result(result, team_name, _witness_analyses(tasks))
 
 
 def build_and_run_crew_streaming(
@@ -274,29 +390,39 @@ def build_and_run_crew_streaming(
     transcript: str,
     step_callback: Callable | None = None,
     task_callback: Callable | None = None,
+    parallel: bool = PARALLEL_WITNESSES,
+    completed_outputs: dict[str, str] | None = None,
+    compaction_callback: Callable | None = None,
 ) -> JudgingResult:
-    """Assemble the crew with streaming callbacks and execute."""
-    agents = {
-        "github": create_github_agent(),
-        "ppt": create_ppt_agent(),
-        "voice": create_voice_agent(),
-        "video": create_video_agent(),
-        "orchestrator": create_orchestrator_agent(),
-    }
+    """Assemble the crew with streaming callbacks and execute.
+
+    ``step_callback`` is called as ``step_callback(step_output, agent_key)`` so
+    steps from concurrently running witnesses are attributed correctly.
+    ``completed_outputs`` maps agent keys to raw outputs from an earlier run;
+    those tasks are skipped and their outputs reused as orchestrator context,
+    as are placeholder digests for witnesses whose input is missing.
+    ``compaction_callback`` is called as ``compaction_callback(entry, totals)``
+    each time a tool output or the transcript is compacted to its budget.
+    """
+    compaction = CompactionReport(on_record=compaction_callback)
+    agents = _create_agents(compaction)
 
     if step_callback:
-        for agent in agents.values():
-            agent.step_callback = step_callback
+        for key, agent in agents.items():
+            agent.step_callback = lambda step_output, key=key: step_callback(step_output, key)
 
-    tasks = _build_tasks(team_name, github_url, pptx_path, video_path, transcript, agents)
+    tasks = _build_tasks(team_name, github_url, pptx_path, video_path, transcript, agents, parallel, compaction)
+    pending = _apply_checkpoints(tasks, _settled_outputs(pptx_path, video_path, completed_outputs))
+    if not pending:
+        return _parse_result(CrewOutput(raw=tasks["orchestrator"].output.raw), team_name, _witness_analyses(tasks))
 
     crew = Crew(
-        agents=list(agents.values()),
-        tasks=list(tasks.values()),
+        agents=[task.agent for task in pending],
+        tasks=pending,
         process=Process.sequential,
         verbose=True,
         task_callback=task_callback,
     )
 
     result = crew.kickoff()
-    return _parse_result(result, team_name)
+    return _parse_result(result, team_name, _witness_analyses(tasks))
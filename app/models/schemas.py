@@ -30,6 +30,10 @@ class AgentAnalysis(BaseModel):
     key_findings: list[str]
     concerns: list[str]
     strengths: list[str]
+    claims: list[str] = Field(
+        default_factory=list,
+        description="Specific, checkable claims or facts for cross-referencing, with slide numbers or timestamps",
+    )
     raw_detail: str = Field(default="", description="Full analysis text from the agent")
 
 
@@ -42,13 +46,18 @@ class Scores(BaseModel):
     overall: float = Field(ge=0, le=10)
 
 
-class JudgingResult(BaseModel):
+class VerdictDraft(BaseModel):
+    """What the orchestrator generates; the witnesses' digests are attached afterwards."""
+
     team_name: str
     scores: Scores
     questions: list[JudgeQuestion]
     key_strengths: list[str]
     key_concerns: list[str]
     voice_script: str = Field(description="Ready-to-read script for an AI judge voice")
+
+
+class JudgingResult(VerdictDraft):
     github_analysis: Optional[AgentAnalysis] = None
     ppt_analysis: Optional[AgentAnalysis] = None
     voice_analysis: Optional[AgentAnalysis] = None
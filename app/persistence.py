@@ -0,0 +1,188 @@
+"""Pluggable durable storage for judging jobs, their event logs and task outputs."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+JOB_STORE_BACKEND = os.getenv("JUDGE_JOB_STORE", "sqlite")
+JOB_DB_PATH = os.getenv(
+    "JUDGE_JOB_DB",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "results", "jobs.sqlite3"),
+)
+
+FINISHED_STATUSES = ("complete", "error")
+
+
+class JobPersistence:
+    """No-op backend: jobs live only in memory. Subclasses make them durable."""
+
+    durable = False
+
+    def save_job(self, record: dict):
+        pass
+
+    def append_event(self, job_id: str, event_id: int, event: dict):
+        pass
+
+    def save_task_output(self, job_id: str, agent_key: str, raw: str):
+        pass
+
+    def delete_task_output(self, job_id: str, agent_key: str):
+        pass
+
+    def task_outputs(self, job_id: str) -> dict[str, str]:
+        return {}
+
+    def load_job(self, job_id: str) -> dict | None:
+        return None
+
+    def unfinished_jobs(self) -> list[dict]:
+        return []
+
+
+class SQLiteJobPersistence(JobPersistence):
+    """SQLite backend in WAL mode, safe to share between the API and pool workers.
+
+    One connection per process, serialised by a lock; writes are small and
+    frequent so each statement commits immediately.
+    """
+
+    durable = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            team_name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            current_agent TEXT,
+            request TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            finished_at REAL,
+            updated_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS events (
+            job_id TEXT NOT NULL,
+            event_id INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            PRIMARY KEY (job_id, event_id)
+        );
+        CREATE TABLE IF NOT EXISTS task_outputs (
+            job_id TEXT NOT NULL,
+            agent TEXT NOT NULL,
+            raw TEXT NOT NULL,
+            created_at REAL,
+            PRIMARY KEY (job_id, agent)
+        );
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections don't survive fork/spawn; reopen in each process.
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def save_job(self, record: dict):
+        self._execute(
+            """
+            INSERT INTO jobs (job_id, team_name, status, current_agent, request, result, error,
+                              created_at, finished_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET
+                status = excluded.status, current_agent = excluded.current_agent,
+                request = excluded.request, result = excluded.result, error = excluded.error,
+                finished_at = excluded.finished_at, updated_at = excluded.updated_at
+            """,
+            (
+                record["job_id"],
+                record["team_name"],
+                record["status"],
+                record.get("current_agent", ""),
+                json.dumps(record.get("request") or {}),
+                json.dumps(record["result"], default=str) if record.get("result") is not None else None,
+                record.get("error"),
+                record.get("created_at"),
+                record.get("finished_at"),
+                time.time(),
+            ),
+        )
+
+    def append_event(self, job_id: str, event_id: int, event: dict):
+        self._execute(
+            "INSERT OR REPLACE INTO events (job_id, event_id, event) VALUES (?, ?, ?)",
+            (job_id, event_id, json.dumps(event, default=str)),
+        )
+
+    def save_task_output(self, job_id: str, agent_key: str, raw: str):
+        self._execute(
+            "INSERT OR REPLACE INTO task_outputs (job_id, agent, raw, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, agent_key, raw, time.time()),
+        )
+
+    def delete_task_output(self, job_id: str, agent_key: str):
+        self._execute("DELETE FROM task_outputs WHERE job_id = ? AND agent = ?", (job_id, agent_key))
+
+    def task_outputs(self, job_id: str) -> dict[str, str]:
+        rows = self._execute("SELECT agent, raw FROM task_outputs WHERE job_id = ?", (job_id,))
+        return dict(rows)
+
+    def load_job(self, job_id: str) -> dict | None:
+        rows = self._execute(
+            "SELECT job_id, team_name, status, current_agent, request, result, error, created_at, finished_at "
+            "FROM jobs WHERE job_id = ?",
+            (job_id,),
+        )
+        return self._hydrate(rows[0]) if rows else None
+
+    def unfinished_jobs(self) -> list[dict]:
+        rows = self._execute(
+            "SELECT job_id, team_name, status, current_agent, request, result, error, created_at, finished_at "
+            f"FROM jobs WHERE status NOT IN ({','.join('?' * len(FINISHED_STATUSES))}) ORDER BY created_at",
+            FINISHED_STATUSES,
+        )
+        return [self._hydrate(row) for row in rows]
+
+    def _hydrate(self, row: tuple) -> dict:
+        job_id, team_name, status, current_agent, request, result, error, created_at, finished_at = row
+        events = self._execute("SELECT event FROM events WHERE job_id = ? ORDER BY event_id", (job_id,))
+        return {
+            "job_id": job_id,
+            "team_name": team_name,
+            "status": status,
+            "current_agent": current_agent or "",
+            "request": json.loads(request) if request else {},
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created_at,
+            "finished_at": finished_at,
+            "events": [json.loads(e) for (e,) in events],
+            "task_outputs": self.task_outputs(job_id),
+        }
+
+
+_persistence: JobPersistence | None = None
+
+
+def get_persistence() -> JobPersistence:
+    global _persistence
+    if _persistence is None:
+        _persistence = SQLiteJobPersistence() if JOB_STORE_BACKEND == "sqlite" else JobPersistence()
+    return _persistence
@@ -0,0 +1,102 @@
+"""Optional process-pool execution of judging crews.
+
+With ``JUDGE_EXECUTION_MODE=process`` each crew runs in a worker from a
+reusable spawn-context pool, so CPU-heavy phases (repo scanning, pptx parsing,
+prompt assembly) don't share the API process's GIL. Events and task
+checkpoints the worker emits travel back, in order, over a manager queue;
+the parent re-publishes the events and records the checkpoints on its job.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable
+
+from app.streaming import JudgingJob, publish_event, record_task_output, subscribe
+
+EXECUTION_MODE = os.getenv("JUDGE_EXECUTION_MODE", "thread")
+PROCESS_WORKERS = int(os.getenv("JUDGE_PROCESS_WORKERS", os.getenv("JUDGE_MAX_CONCURRENT", "4")))
+
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_manager = None
+
+
+def _get_pool():
+    global _pool, _manager
+    with _lock:
+        if _pool is None:
+            ctx = get_context("spawn")
+            _manager = ctx.Manager()
+            _pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS, mp_context=ctx)
+        return _pool, _manager
+
+
+def shutdown_pool():
+    global _pool, _manager
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _manager.shutdown()
+            _pool = _manager = None
+
+
+def _pump(job: JudgingJob, events):
+    while True:
+        message = events.get()
+        if message is None:
+            return
+        kind, payload = message
+        if kind == "task_output":
+            record_task_output(job, *payload)
+            continue
+        event = payload
+        if event.get("type") == "agent_started":
+            job.current_agent = event.get("agent", job.current_agent)
+        publish_event(job, event)
+
+
+def run_in_pool(job: JudgingJob, fn: Callable[..., Any], *args) -> Any:
+    """Run ``fn(proxy_job, *args)`` in the pool and block until it returns.
+
+    ``fn`` must be a module-level function. ``proxy_job`` is a worker-side
+    JudgingJob whose events and task checkpoints are forwarded to ``job``
+    as they happen.
+    """
+    pool, manager = _get_pool()
+    events = manager.Queue()
+    pump = threading.Thread(target=_pump, args=(job, events), daemon=True)
+    pump.start()
+    try:
+        return pool.submit(_call_with_proxy, fn, job.job_id, job.team_name, events, *args).result()
+    finally:
+        events.put(None)
+        pump.join()
+
+
+def _call_with_proxy(fn: Callable[..., Any], job_id: str, team_name: str, events, *args) -> Any:
+    proxy = JudgingJob(
+        job_id=job_id,
+        team_name=team_name,
+        forward_task_output=lambda agent_key, raw: events.put(("task_output", (agent_key, raw))),
+    )
+    subscribe(proxy, lambda _index, event: events.put(("event", event)))
+    return fn(proxy, *args)
+
+
+def run_crew_job(job: JudgingJob, crew_kwargs: dict, parallel: bool) -> dict:
+    """Worker-side entry point: run the streaming crew and return the result as a dict."""
+    from app.crew import build_and_run_crew_streaming, skipped_agents
+    from app.streaming import make_compaction_callback, make_step_callback, make_task_callback
+
+    settled = set(crew_kwargs.get("completed_outputs") or ())
+    settled.update(skipped_agents(crew_kwargs.get("pptx_path"), crew_kwargs.get("video_path")))
+    result = build_and_run_crew_streaming(
+        **crew_kwargs,
+        step_callback=make_step_callback(job),
+        task_callback=make_task_callback(job, parallel=parallel, completed=settled),
+        parallel=parallel,
+        compaction_callback=make_compaction_callback(job),
+    )
+    return result.model_dump()
@@ -0,0 +1,123 @@
+"""Bounded worker pool with a priority admission queue for judging jobs."""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Callable
+
+from app.streaming import JudgingJob, push_event
+
+MAX_CONCURRENT_JOBS = int(os.getenv("JUDGE_MAX_CONCURRENT", "4"))
+MAX_QUEUED_JOBS = int(os.getenv("JUDGE_MAX_QUEUE", "100"))
+# Seed for the running average of job duration, used for wait estimates.
+EXPECTED_JOB_SECONDS = float(os.getenv("JUDGE_EXPECTED_JOB_SECONDS", "180"))
+
+# Priorities are assigned by the server, never taken from the submitter.
+# Resumed and retried jobs already waited their turn once, so they go first.
+PRIORITY_RESUMED = 0
+PRIORITY_NEW = 1
+
+
+class QueueFullError(Exception):
+    """Raised when the admission queue is saturated; carries a Retry-After hint."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Judging queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JudgingScheduler:
+    """Runs at most ``max_concurrent`` jobs; the rest wait in a priority queue.
+
+    Lower ``priority`` values run first; equal priorities are FIFO. Waiting
+    jobs get a ``queued`` event whenever their position changes.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS, max_queued: int = MAX_QUEUED_JOBS):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max_queued
+        self._heap: list[tuple[int, int, JudgingJob, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._positions: dict[str, int] = {}
+        self._running = 0
+        self._completed = 0
+        self._avg_seconds = EXPECTED_JOB_SECONDS
+        self._workers: list[threading.Thread] = []
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        return max(1, math.ceil(self._avg_seconds / self.max_concurrent))
+
+    def check_capacity(self):
+        with self._cond:
+            if len(self._heap) >= self.max_queued:
+                raise QueueFullError(self.retry_after())
+
+    def submit(self, job: JudgingJob, fn: Callable[[], None], priority: int = 0):
+        with self._cond:
+            if len(self._heap) >= self.max_queued:
+                raise QueueFullError(self.retry_after())
+            job.status = "queued"
+            heapq.heappush(self._heap, (priority, next(self._seq), job, fn))
+            self._ensure_workers()
+            self._announce_positions()
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "running": self._running,
+                "queued": len(self._heap),
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+                "completed": self._completed,
+                "avg_job_seconds": round(self._avg_seconds, 1),
+            }
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_concurrent:
+            worker = threading.Thread(target=self._work, name=f"judge-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _announce_positions(self):
+        # Called with the lock held. Only positions that moved are re-sent.
+        for position, (_, _, job, _) in enumerate(sorted(self._heap, key=lambda e: e[:2]), 1):
+            if self._positions.get(job.job_id) == position:
+                continue
+            self._positions[job.job_id] = position
+            push_event(job, "queued", {
+                "position": position,
+                "estimated_wait_s": math.ceil(position / self.max_concurrent) * round(self._avg_seconds),
+            })
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, job, fn = heapq.heappop(self._heap)
+                self._positions.pop(job.job_id, None)
+                self._running += 1
+                self._announce_positions()
+
+            started = time.monotonic()
+            try:
+                fn()
+            except Exception as e:
+                job.status = "error"
+                job.error = str(e)
+                push_event(job, "error", {"message": str(e)})
+            finally:
+                elapsed = time.monotonic() - started
+                with self._cond:
+                    self._running -= 1
+                    self._completed += 1
+                    self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+
+scheduler = JudgingScheduler()
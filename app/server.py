@@ -3,27 +3,60 @@
 import asyncio
 import json
 import os
-import threading
+from concurrent.futures import Future
 from contextlib import asynccontextmanager
-from datetime import datetime
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, Header, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
-from app.crew import build_and_run_crew, build_and_run_crew_streaming
+from app.crew import (
+    PARALLEL_WITNESSES,
+    build_and_run_crew_streaming,
+    placeholder_analysis,
+    skipped_agents,
+)
 from app.models.schemas import JudgingResult
+from app.process_pool import EXECUTION_MODE, run_crew_job, run_in_pool, shutdown_pool
+from app.scheduler import PRIORITY_NEW, PRIORITY_RESUMED, QueueFullError, scheduler
+from app.tools.github_tool import cache_stats as github_cache_stats
+from app.tools.pptx_tool import cache_stats as pptx_cache_stats
+from app.tools.video_tool import cache_stats as video_cache_stats
+from app.tools.video_tool import start_upload as start_video_upload
+from app.uploads import (
+    MAX_PPTX_BYTES,
+    MAX_VIDEO_BYTES,
+    UPLOAD_DIR,
+    RequestSizeLimitMiddleware,
+    SavedUpload,
+    UploadTooLargeError,
+    upload_store,
+)
 from app.streaming import (
-    AGENT_DISPLAY,
+    AGENT_ORDER,
+    WITNESS_AGENTS,
+    EventSubscription,
+    JudgingJob,
+    checkpointed_outputs,
+    compaction_summary,
     create_job,
+    discard_task_outputs,
+    first_agents,
     get_job,
+    interrupted_jobs,
+    job_metrics,
+    make_compaction_callback,
     make_step_callback,
     make_task_callback,
     push_event,
+    reopen_job,
+    restore_job,
+    skip_agent,
+    start_agent,
 )
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "dist")
 
@@ -32,7 +65,9 @@ STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend"
 async def lifespan(app: FastAPI):
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     os.makedirs(RESULTS_DIR, exist_ok=True)
+    _resume_interrupted_jobs()
     yield
+    shutdown_pool()
 
 
 app = FastAPI(
@@ -53,16 +88,97 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Oversized bodies are refused here, before form parsing spools them to disk.
+app.add_middleware(RequestSizeLimitMiddleware)
+
+
+async def _save_upload(upload_file: UploadFile, suffix: str, max_bytes: int) -> SavedUpload:
+    """Stream an upload into the blob store in a worker thread; 413 if it exceeds ``max_bytes``."""
+    try:
+        return await run_in_threadpool(upload_store.save, upload_file.file, suffix, max_bytes, upload_file.filename)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=f"{upload_file.filename}: {e}")
+    finally:
+        await upload_file.close()
+
+
+async def _save_submission(
+    team_name: str, pptx_file: UploadFile | None, video_file: UploadFile | None
+) -> dict[str, SavedUpload]:
+    """Store a submission's files (deduplicated by content) and record which blobs it uses."""
+    uploads = {}
+    if pptx_file and pptx_file.filename:
+        uploads["pptx"] = await _save_upload(pptx_file, ".pptx", MAX_PPTX_BYTES)
+    if video_file and video_file.filename:
+        ext = os.path.splitext(video_file.filename)[1] or ".mp4"
+        uploads["video"] = await _save_upload(video_file, ext, MAX_VIDEO_BYTES)
+    if uploads:
+        await run_in_threadpool(upload_store.record_submission, team_name, uploads)
+    return uploads
+
+
+CREW_ARGS = ("team_name", "github_url", "pptx_path", "video_path", "transcript")
 
 
-def _save_upload(upload_file: UploadFile, team_name: str, suffix: str) -> str:
-    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in team_name)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{safe_name}_{timestamp}{suffix}"
-    path = os.path.join(UPLOAD_DIR, filename)
-    with open(path, "wb") as f:
-        f.write(upload_file.file.read())
-    return path
+def _job_request(team_name: str, github_url: str, transcript: str, uploads: dict[str, SavedUpload]) -> dict:
+    """The inputs ``_run_job`` needs to run (or re-run) a submission's crew."""
+    return {
+        "team_name": team_name,
+        "github_url": github_url,
+        "pptx_path": uploads["pptx"].path if "pptx" in uploads else None,
+        "video_path": uploads["video"].path if "video" in uploads else None,
+        "transcript": transcript,
+        "uploads": {kind: upload.sha256 for kind, upload in uploads.items()},
+    }
+
+
+def _run_job(job: JudgingJob):
+    """Run (or resume) a job's crew, skipping tasks that have a checkpoint or no input."""
+    try:
+        completed = checkpointed_outputs(job)
+        skipped = [
+            key for key in skipped_agents(job.request.get("pptx_path"), job.request.get("video_path"))
+            if key not in completed
+        ]
+        settled = set(completed) | set(skipped)
+        job.status = "running"
+        for agent_key in skipped:
+            skip_agent(job, agent_key, placeholder_analysis(agent_key).summary)
+        for agent_key in first_agents(settled, PARALLEL_WITNESSES):
+            start_agent(job, agent_key)
+        crew_kwargs = {key: job.request.get(key) for key in CREW_ARGS}
+        crew_kwargs["completed_outputs"] = completed
+        if EXECUTION_MODE == "process":
+            job.result = run_in_pool(job, run_crew_job, crew_kwargs, PARALLEL_WITNESSES)
+        else:
+            result = build_and_run_crew_streaming(
+                **crew_kwargs,
+                step_callback=make_step_callback(job),
+                task_callback=make_task_callback(job, parallel=PARALLEL_WITNESSES, completed=settled),
+                parallel=PARALLEL_WITNESSES,
+                compaction_callback=make_compaction_callback(job),
+            )
+            job.result = result.model_dump() if hasattr(result, "model_dump") else json.loads(result.json())
+        job.status = "complete"
+        push_event(job, "verdict", {"result": job.result, "compaction": compaction_summary(job)})
+    except Exception as e:
+        job.status = "error"
+        job.error = str(e)
+        push_event(job, "error", {"message": str(e)})
+
+
+def _resume_interrupted_jobs():
+    """Requeue jobs that were queued or running when the server last stopped."""
+    for record in interrupted_jobs():
+        job = restore_job(record)
+        completed = checkpointed_outputs(job)
+        push_event(job, "session_resumed", {"job_id": job.job_id, "completed_agents": sorted(completed)})
+        try:
+            scheduler.submit(job, lambda job=job: _run_job(job), priority=PRIORITY_RESUMED)
+        except QueueFullError as e:
+            job.status = "error"
+            job.error = str(e)
+            push_event(job, "error", {"message": str(e)})
 
 
 # ---------------------------------------------------------------------------
@@ -75,6 +191,26 @@ async def health():
     return {"status": "ok", "service": "Hackathon Judge AI", "version": "1.0.0"}
 
 
+@app.get("/api/queue", tags=["Health"])
+async def queue_stats():
+    return scheduler.stats()
+
+
+@app.get("/api/jobs/stats", tags=["Health"])
+async def jobs_stats():
+    return job_metrics()
+
+
+@app.get("/api/cache/stats", tags=["Health"])
+async def cache_stats():
+    return {
+        "github": github_cache_stats(),
+        "pptx": pptx_cache_stats(),
+        "video": video_cache_stats(),
+        "uploads": upload_store.stats(),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Streaming judging (new — used by the UI)
 # ---------------------------------------------------------------------------
@@ -88,75 +224,60 @@ async def start_judging(
     pptx_file: UploadFile | None = File(None),
     video_file: UploadFile | None = File(None),
 ):
-    """Start a judging session. Returns a job_id for streaming progress via SSE."""
-    pptx_path = None
-    video_path = None
+    """Queue a judging session. Returns a job_id for streaming progress via SSE.
 
-    if pptx_file and pptx_file.filename:
-        pptx_path = _save_upload(pptx_file, team_name, ".pptx")
-    if video_file and video_file.filename:
-        ext = os.path.splitext(video_file.filename)[1] or ".mp4"
-        video_path = _save_upload(video_file, team_name, ext)
+    Responds 429 with Retry-After when the admission queue is full. New
+    submissions are scheduled first come, first served.
+    """
+    try:
+        scheduler.check_capacity()
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-    job = create_job(team_name)
+    uploads = await _save_submission(team_name, pptx_file, video_file)
+
+    job = create_job(team_name, request=_job_request(team_name, github_url, transcript, uploads))
 
     push_event(job, "session_started", {
         "team_name": team_name,
         "job_id": job.job_id,
     })
 
-    job.current_agent = "github"
-    push_event(job, "agent_started", {
-        "agent": "github",
-        "display": AGENT_DISPLAY["github"],
-    })
-
-    def _run():
-        try:
-            job.status = "running"
-            result = build_and_run_crew_streaming(
-                team_name=team_name,
-                github_url=github_url,
-                pptx_path=pptx_path,
-                video_path=video_path,
-                transcript=transcript,
-                step_callback=make_step_callback(job),
-                task_callback=make_task_callback(job),
-            )
-            job.result = result.model_dump() if hasattr(result, "model_dump") else json.loads(result.json())
-            job.status = "complete"
-            push_event(job, "verdict", {"result": job.result})
-        except Exception as e:
-            job.status = "error"
-            job.error = str(e)
-            push_event(job, "error", {"message": str(e)})
+    try:
+        scheduler.submit(job, lambda: _run_job(job), priority=PRIORITY_NEW)
+    except QueueFullError as e:
+        job.status = "error"
+        job.error = str(e)
+        push_event(job, "error", {"message": str(e)})
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-    thread = threading.Thread(target=_run, daemon=True)
-    thread.start()
+    if "video" in uploads:
+        # Only for admitted jobs: let Gemini ingest the demo while the job queues
+        # and the other witnesses run.
+        start_video_upload(uploads["video"].path, uploads["video"].sha256, asyncio.get_running_loop())
 
-    return {"job_id": job.job_id, "status": "started"}
+    return {"job_id": job.job_id, "status": job.status}
 
 
 @app.get("/api/judge/{job_id}/stream", tags=["Judging"])
-async def stream_judging(job_id: str):
-    """SSE endpoint — streams real-time events from the judging session."""
+async def stream_judging(job_id: str, last_event_id: str | None = Header(None)):
+    """SSE endpoint — streams real-time events from the judging session.
+
+    Every event carries an ``id``; reconnecting clients that send
+    ``Last-Event-ID`` resume right after the last event they received.
+    """
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    try:
+        resume_from = int(last_event_id or 0)
+    except ValueError:
+        resume_from = 0
+
     async def event_generator():
-        while True:
-            try:
-                event = job.event_queue.get_nowait()
-                yield f"data: {json.dumps(event, default=str)}\n\n"
-                if event.get("type") in ("verdict", "error"):
-                    break
-            except Exception:
-                if job.status in ("complete", "error"):
-                    if job.result:
-                        yield f"data: {json.dumps({'type': 'verdict', 'result': job.result}, default=str)}\n\n"
-                    break
-                await asyncio.sleep(0.5)
+        async for event_id, event in EventSubscription(job, resume_from):
+            yield f"id: {event_id}\ndata: {json.dumps(event, default=str)}\n\n"
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -174,6 +295,52 @@ async def get_judging_result(job_id: str):
     return job.result
 
 
+@app.post("/api/judge/{job_id}/retry", tags=["Judging"])
+async def retry_judging(job_id: str, rerun: list[str] | None = Query(None)):
+    """Re-run a failed judging session from its task checkpoints.
+
+    Witness outputs that finished before the failure are reused as context,
+    so usually only the orchestrator runs again. Pass ``rerun`` (repeatable)
+    to discard specific witness checkpoints; the orchestrator, being
+    downstream of every witness, always re-runs. Events continue on the
+    job's existing stream.
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "error":
+        raise HTTPException(status_code=409, detail=f"Only failed jobs can be retried (status: {job.status})")
+    if not job.request:
+        raise HTTPException(status_code=409, detail="Job has no recorded request to retry")
+    unknown = sorted(set(rerun or ()) - set(WITNESS_AGENTS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown agents: {', '.join(unknown)}")
+    try:
+        scheduler.check_capacity()
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    discard_task_outputs(job, [*(rerun or ()), "orchestrator"])
+    completed = checkpointed_outputs(job)
+    skipped = skipped_agents(job.request.get("pptx_path"), job.request.get("video_path"))
+    reopen_job(job)
+    push_event(job, "retry_started", {
+        "job_id": job.job_id,
+        "reused_agents": sorted(completed),
+        "rerun_agents": [key for key in AGENT_ORDER if key not in completed and key not in skipped],
+    })
+
+    try:
+        scheduler.submit(job, lambda: _run_job(job), priority=PRIORITY_RESUMED)
+    except QueueFullError as e:
+        job.status = "error"
+        job.error = str(e)
+        push_event(job, "error", {"message": str(e)})
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    return {"job_id": job.job_id, "status": job.status, "reused_agents": sorted(completed)}
+
+
 # ---------------------------------------------------------------------------
 # Synchronous judging (original — still available)
 # ---------------------------------------------------------------------------
@@ -187,23 +354,38 @@ async def judge_team(
     pptx_file: UploadFile | None = File(None),
     video_file: UploadFile | None = File(None),
 ) -> JudgingResult:
-    pptx_path = None
-    video_path = None
-    if pptx_file and pptx_file.filename:
-        pptx_path = _save_upload(pptx_file, team_name, ".pptx")
-    if video_file and video_file.filename:
-        ext = os.path.splitext(video_file.filename)[1] or ".mp4"
-        video_path = _save_upload(video_file, team_name, ext)
+    """Judge a submission and wait for the verdict.
+
+    Runs as a regular job on the same scheduler as ``/api/judge/start``, so
+    it shares the concurrency bound and responds 429 when the queue is full.
+    """
     try:
-        return build_and_run_crew(
-            team_name=team_name,
-            github_url=github_url,
-            pptx_path=pptx_path,
-            video_path=video_path,
-            transcript=transcript,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Judging failed: {str(e)}")
+        scheduler.check_capacity()
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    uploads = await _save_submission(team_name, pptx_file, video_file)
+    job = create_job(team_name, request=_job_request(team_name, github_url, transcript, uploads))
+    finished: Future = Future()
+
+    def run():
+        try:
+            _run_job(job)
+        finally:
+            finished.set_result(None)
+
+    try:
+        scheduler.submit(job, run, priority=PRIORITY_NEW)
+    except QueueFullError as e:
+        job.status = "error"
+        job.error = str(e)
+        push_event(job, "error", {"message": str(e)})
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    await asyncio.wrap_future(finished)
+    if job.status != "complete":
+        raise HTTPException(status_code=500, detail=f"Judging failed: {job.error}")
+    return job.result
 
 
 # ---------------------------------------------------------------------------
@@ -1,11 +1,17 @@
 """Job manager with SSE streaming support for real-time agent updates."""
 
+import asyncio
 import json
-import queue
+import os
+import threading
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
+
+from app.compaction import summarize
+from app.persistence import get_persistence
 
 
 @dataclass
@@ -15,13 +21,149 @@ class JudgingJob:
     status: str = "pending"
     current_agent: str = ""
     events: list = field(default_factory=list)
-    event_queue: queue.Queue = field(default_factory=queue.Queue)
+    # Callables invoked with (index, event) for every published event, from the publishing thread.
+    subscribers: list[Callable[[int, dict], None]] = field(default_factory=list)
     result: dict | None = None
     error: str | None = None
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: float | None = None
+    # Inputs needed to re-run the crew, and full raw outputs of finished tasks.
+    request: dict = field(default_factory=dict)
+    task_outputs: dict[str, str] = field(default_factory=dict)
+    # Set on pool-worker proxies: hands each checkpoint to the parent instead of persisting it here.
+    forward_task_output: Callable[[str, str], None] | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _notifiers: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+
+JOB_SPILL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results", "jobs")
+MAX_RESIDENT_JOBS = int(os.getenv("JUDGE_MAX_RESIDENT_JOBS", "200"))
+# Finished jobs stay in memory this long before being spilled to disk.
+JOB_TTL_SECONDS = float(os.getenv("JUDGE_JOB_TTL_SECONDS", "3600"))
+
+
+class JobStore:
+    """Registry of live jobs that spills finished ones out of memory.
+
+    Running and queued jobs are never evicted. Finished jobs are spilled once
+    they outlive ``ttl`` or, oldest first, when more than ``max_resident``
+    jobs are held. ``get`` transparently reloads a spilled job (result, error
+    and event log) so results and SSE replays keep working after eviction.
+    With a durable persistence backend the job is already on disk there;
+    otherwise it is written as JSON under ``JOB_SPILL_DIR``.
+    """
+
+    def __init__(self, max_resident: int = MAX_RESIDENT_JOBS, ttl: float = JOB_TTL_SECONDS, spill_dir: str = JOB_SPILL_DIR):
+        self.max_resident = max_resident
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self._jobs: dict[str, JudgingJob] = {}
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.rehydrated = 0
+        self._last_sweep = 0.0
+
+    def add(self, job: JudgingJob):
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self.evict()
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def get(self, job_id: str) -> JudgingJob | None:
+        if time.time() - self._last_sweep > 60:
+            self.evict()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        job = self._load(job_id)
+        if job is not None:
+            self.rehydrated += 1
+        return job
 
+    def evict(self):
+        now = time.time()
+        with self._lock:
+            self._last_sweep = now
+            finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+            overflow = len(self._jobs) - self.max_resident
+            victims = []
+            for job in finished:
+                if now - job.finished_at > self.ttl or len(victims) < overflow:
+                    victims.append(job)
+            for job in victims:
+                del self._jobs[job.job_id]
+        for job in victims:
+            self._spill(job)
+            self.evicted += 1
 
-_jobs: dict[str, JudgingJob] = {}
+    def metrics(self) -> dict:
+        self.evict()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "resident_jobs": len(jobs),
+            "running_jobs": sum(1 for j in jobs if not j.finished),
+            "resident_bytes": sum(_job_bytes(j) for j in jobs),
+            "evicted": self.evicted,
+            "rehydrated": self.rehydrated,
+        }
+
+    def _path(self, job_id: str) -> str:
+        safe_id = "".join(c for c in job_id if c.isalnum() or c in "-_")
+        return os.path.join(self.spill_dir, f"{safe_id}.json")
+
+    def _spill(self, job: JudgingJob):
+        persistence = get_persistence()
+        if persistence.durable:
+            persistence.save_job(_job_record(job))
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._path(job.job_id)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(_job_record(job), f, ensure_ascii=False, default=str)
+        os.replace(f"{path}.tmp", path)
+
+    def _load(self, job_id: str) -> JudgingJob | None:
+        record = get_persistence().load_job(job_id)
+        if record is not None:
+            return JudgingJob(**record)
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return JudgingJob(**record)
+
+
+def _job_record(job: JudgingJob) -> dict:
+    return {
+        "job_id": job.job_id,
+        "team_name": job.team_name,
+        "status": job.status,
+        "current_agent": job.current_agent,
+        "events": job.events,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "request": job.request,
+        "task_outputs": job.task_outputs,
+    }
+
+
+def _job_bytes(job: JudgingJob) -> int:
+    return len(json.dumps(_job_record(job), default=str))
+
+
+_store = JobStore()
 
 AGENT_MAP = {
     "Senior Code Reviewer & Architecture Analyst": "github",
@@ -31,6 +173,11 @@ AGENT_MAP = {
     "Chief Judge & Cross-Reference Analyst": "orchestrator",
 }
 
+TERMINAL_EVENTS = ("verdict", "error")
+
+AGENT_ORDER = ["github", "ppt", "voice", "video", "orchestrator"]
+WITNESS_AGENTS = AGENT_ORDER[:-1]
+
 AGENT_DISPLAY = {
     "github": {"name": "GitHub Agent", "title": "Code & Architecture Witness", "icon": "code"},
     "ppt": {"name": "PPT Agent", "title": "Business Strategy Witness", "icon": "presentation"},
@@ -40,32 +187,188 @@ AGENT_DISPLAY = {
 }
 
 
-def create_job(team_name: str) -> JudgingJob:
+def _persist(job: JudgingJob):
+    """Mirror the job's events and state changes into the persistence backend."""
+    persistence = get_persistence()
+    if not persistence.durable:
+        return
+
+    def on_event(index: int, event: dict):
+        persistence.append_event(job.job_id, index + 1, event)
+        if event.get("type") != "agent_step":
+            persistence.save_job(_job_record(job))
+
+    persistence.save_job(_job_record(job))
+    subscribe(job, on_event)
+
+
+def create_job(team_name: str, request: dict | None = None) -> JudgingJob:
     job_id = str(uuid.uuid4())[:8]
-    job = JudgingJob(job_id=job_id, team_name=team_name)
-    _jobs[job_id] = job
+    job = JudgingJob(job_id=job_id, team_name=team_name, request=request or {})
+    _persist(job)
+    _store.add(job)
     return job
 
 
+def restore_job(record: dict) -> JudgingJob:
+    """Re-register a job loaded from persistence, keeping its event ids stable."""
+    job = JudgingJob(**record)
+    _persist(job)
+    _store.add(job)
+    return job
+
+
+def reopen_job(job: JudgingJob):
+    """Return a finished job to the pending state so it can run again.
+
+    A job rehydrated from a spill is re-registered and re-attached to
+    persistence. Its event log is kept; new events continue its ids.
+    """
+    with job._lock:
+        job.finished_at = None
+    job.status = "pending"
+    job.result = None
+    job.error = None
+    if job.job_id not in _store:
+        _persist(job)
+        _store.add(job)
+
+
+def interrupted_jobs() -> list[dict]:
+    """Persisted jobs that were queued or running when the process last stopped."""
+    return get_persistence().unfinished_jobs()
+
+
+def checkpointed_outputs(job: JudgingJob) -> dict[str, str]:
+    """Raw outputs of every task this job has finished, including restored checkpoints."""
+    return {**get_persistence().task_outputs(job.job_id), **job.task_outputs}
+
+
+def record_task_output(job: JudgingJob, agent_key: str, raw: str):
+    job.task_outputs[agent_key] = raw
+    if job.forward_task_output is not None:
+        job.forward_task_output(agent_key, raw)
+    else:
+        get_persistence().save_task_output(job.job_id, agent_key, raw)
+
+
+def discard_task_outputs(job: JudgingJob, agent_keys):
+    persistence = get_persistence()
+    for agent_key in agent_keys:
+        job.task_outputs.pop(agent_key, None)
+        persistence.delete_task_output(job.job_id, agent_key)
+
+
 def get_job(job_id: str) -> JudgingJob | None:
-    return _jobs.get(job_id)
+    return _store.get(job_id)
+
+
+def job_metrics() -> dict:
+    return _store.metrics()
+
+
+def publish_event(job: JudgingJob, event: dict):
+    with job._lock:
+        job.events.append(event)
+        index = len(job.events) - 1
+        subscribers = list(job.subscribers)
+        if event.get("type") in TERMINAL_EVENTS:
+            job.finished_at = time.time()
+    for subscriber in subscribers:
+        subscriber(index, event)
 
 
 def push_event(job: JudgingJob, event_type: str, data: dict):
     event = {"type": event_type, "timestamp": datetime.now().isoformat(), **data}
-    job.events.append(event)
-    job.event_queue.put(event)
+    publish_event(job, event)
+
+
+def subscribe(job: JudgingJob, callback: Callable[[int, dict], None]):
+    with job._lock:
+        job.subscribers.append(callback)
+
+
+class _LoopNotifier:
+    """Wakes every subscription on one event loop when a job publishes.
+
+    Publishing costs at most one ``call_soon_threadsafe`` per loop, and
+    bursts of events coalesce into a single wake-up. Subscribers read the
+    shared log from their own cursor, so fan-out is O(1) per event however
+    many clients are attached.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._future = loop.create_future()
+        self._pending = False
+        self._lock = threading.Lock()
+
+    def __call__(self, index: int, event: dict):
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+        try:
+            self.loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            pass  # loop closed (e.g. server reload); its subscribers are gone
+
+    def _wake(self):
+        with self._lock:
+            self._pending = False
+        future, self._future = self._future, self.loop.create_future()
+        future.set_result(None)
+
+    async def wait(self):
+        # Shielded: a disconnecting client must not cancel the future others await.
+        await asyncio.shield(self._future)
+
+
+class EventSubscription:
+    """Async iterator of ``(event_id, event)`` pairs with its own cursor into the job log.
+
+    Event ids are 1-based positions in ``job.events``; pass the last id a
+    client saw to resume right after it without gaps or duplicates.
+
+    Iteration ends only once the log's last event is terminal. A terminal
+    event from a run that was later retried is replayed like any other, so
+    a fresh subscriber still follows the retry through to its outcome.
+    """
+
+    def __init__(self, job: JudgingJob, last_event_id: int = 0):
+        loop = asyncio.get_running_loop()
+        with job._lock:
+            notifier = job._notifiers.get(loop)
+            if notifier is None:
+                notifier = job._notifiers[loop] = _LoopNotifier(loop)
+                job.subscribers.append(notifier)
+        self.job = job
+        self.cursor = max(0, last_event_id)
+        self._notifier = notifier
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        events = self.job.events
+        while True:
+            while self.cursor < len(events):
+                self.cursor += 1
+                yield self.cursor, events[self.cursor - 1]
+            if events and events[-1].get("type") in TERMINAL_EVENTS:
+                return
+            await self._notifier.wait()
 
 
 def make_step_callback(job: JudgingJob):
     """Create a step_callback for CrewAI agents that pushes events to the job queue."""
 
-    def callback(step_output: Any):
-        agent_role = getattr(step_output, "agent", "")
-        if hasattr(agent_role, "role"):
-            agent_role = agent_role.role
-
-        agent_key = AGENT_MAP.get(str(agent_role), job.current_agent or "unknown")
+    def callback(step_output: Any, agent_key: str | None = None):
+        if agent_key is None:
+            agent_role = getattr(step_output, "agent", "")
+            if hasattr(agent_role, "role"):
+                agent_role = agent_role.role
+            agent_key = AGENT_MAP.get(str(agent_role), job.current_agent or "unknown")
 
         text = ""
         if hasattr(step_output, "output"):
@@ -80,34 +383,112 @@ def make_step_callback(job: JudgingJob):
     return callback
 
 
-def make_task_callback(job: JudgingJob):
-    """Create a task_callback for CrewAI crew that fires when each task finishes."""
+def make_compaction_callback(job: JudgingJob):
+    """Create a callback that reports each compacted agent input as an event."""
+
+    def callback(entry: dict, totals: dict):
+        push_event(job, "input_compacted", {
+            **entry,
+            "job_tokens_saved": totals["tokens_saved"],
+            "job_compaction_ratio": totals["compaction_ratio"],
+        })
+
+    return callback
+
+
+def compaction_summary(job: JudgingJob) -> dict:
+    """Token savings for the whole job, folded from its ``input_compacted`` events.
+
+    Only the latest compaction of each (agent, source) counts, so a retried
+    agent's input isn't counted twice.
+    """
+    latest = {}
+    for event in job.events:
+        if event.get("type") == "input_compacted":
+            entry = {key: event[key] for key in ("agent", "source", "tokens_before", "tokens_after", "budget")}
+            latest[(entry["agent"], entry["source"])] = entry
+    return summarize(list(latest.values()))
+
+
+def _task_agent_key(task_output: Any) -> str:
+    """Resolve which agent produced a task output from the task's own identity."""
+    name = getattr(task_output, "name", None)
+    if name in AGENT_DISPLAY:
+        return name
+    return AGENT_MAP.get(str(getattr(task_output, "agent", "")), "unknown")
+
+
+def _task_summary(task_output: Any, raw: str) -> str:
+    # Witnesses return a structured digest; show its summary rather than raw JSON.
+    summary = getattr(getattr(task_output, "pydantic", None), "summary", None)
+    return summary if isinstance(summary, str) and summary else raw[:800]
+
+
+def start_agent(job: JudgingJob, agent_key: str):
+    job.current_agent = agent_key
+    push_event(job, "agent_started", {
+        "agent": agent_key,
+        "display": AGENT_DISPLAY.get(agent_key, {}),
+    })
 
-    task_index = {"count": 0}
-    agent_order = ["github", "ppt", "voice", "video", "orchestrator"]
+
+def skip_agent(job: JudgingJob, agent_key: str, reason: str):
+    """Announce a witness that won't run because its input is missing."""
+    push_event(job, "agent_skipped", {
+        "agent": agent_key,
+        "reason": reason,
+        "display": AGENT_DISPLAY.get(agent_key, {}),
+    })
+
+
+def first_agents(completed, parallel: bool = True) -> list[str]:
+    """Agents that start right away, given tasks already checkpointed as ``completed``."""
+    if parallel:
+        pending = [key for key in WITNESS_AGENTS if key not in completed]
+        if pending:
+            return pending
+    pending = [key for key in AGENT_ORDER if key not in completed]
+    return pending[:1]
+
+
+def make_task_callback(job: JudgingJob, parallel: bool = True, completed=()):
+    """Create a task_callback for CrewAI crew that fires when each task finishes.
+
+    Completions are attributed by task name rather than arrival order, since
+    witness tasks may finish in any order when ``parallel`` is set. The
+    orchestrator is announced once every witness has completed; in sequential
+    mode the next agent in ``AGENT_ORDER`` is announced instead. Each full
+    output is checkpointed so an interrupted job can resume after it.
+    ``completed`` lists agents whose outputs were restored from a checkpoint
+    or that were skipped for lack of input.
+    """
+
+    lock = threading.Lock()
+    completed: set[str] = set(completed)
 
     def callback(task_output: Any):
-        idx = task_index["count"]
-        agent_key = agent_order[idx] if idx < len(agent_order) else "unknown"
-        task_index["count"] += 1
+        agent_key = _task_agent_key(task_output)
 
         raw = ""
         if hasattr(task_output, "raw"):
-            raw = task_output.raw[:800]
+            raw = task_output.raw
+            record_task_output(job, agent_key, raw)
 
-        push_event(job, "agent_complete", {
-            "agent": agent_key,
-            "summary": raw,
-            "display": AGENT_DISPLAY.get(agent_key, {}),
-        })
-
-        next_idx = task_index["count"]
-        if next_idx < len(agent_order):
-            next_agent = agent_order[next_idx]
-            job.current_agent = next_agent
-            push_event(job, "agent_started", {
-                "agent": next_agent,
-                "display": AGENT_DISPLAY.get(next_agent, {}),
+        with lock:
+            completed.add(agent_key)
+            push_event(job, "agent_complete", {
+                "agent": agent_key,
+                "summary": _task_summary(task_output, raw),
+                "display": AGENT_DISPLAY.get(agent_key, {}),
             })
 
+            if parallel:
+                if agent_key != "orchestrator" and completed.issuperset(WITNESS_AGENTS):
+                    start_agent(job, "orchestrator")
+            elif agent_key in AGENT_ORDER:
+                following = AGENT_ORDER[AGENT_ORDER.index(agent_key) + 1:]
+                next_agent = next((key for key in following if key not in completed), None)
+                if next_agent:
+                    start_agent(job, next_agent)
+
     return callback
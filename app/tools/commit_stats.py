@@ -0,0 +1,209 @@
+"""Commit-history analytics from one streamed ``git log --numstat`` pass."""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator
+
+# A commit touching at least this many lines, or this share of all churn, is a mega-commit.
+MEGA_COMMIT_LINES = int(os.getenv("MEGA_COMMIT_LINES", "2000"))
+MEGA_COMMIT_SHARE = float(os.getenv("MEGA_COMMIT_SHARE", "0.5"))
+# The share rule needs some history and a sizeable commit, or a small repo's scaffold commit trips it.
+MEGA_COMMIT_SHARE_MIN_COMMITS = int(os.getenv("MEGA_COMMIT_SHARE_MIN_COMMITS", "5"))
+MEGA_COMMIT_SHARE_MIN_LINES = int(os.getenv("MEGA_COMMIT_SHARE_MIN_LINES", "200"))
+
+RECENT_COMMITS = 10
+MAX_LISTED = 20
+# The structured summary keeps this many authors (by commits) and busiest days; the rest are totalled.
+MAX_AUTHORS = int(os.getenv("COMMIT_STATS_MAX_AUTHORS", "10"))
+MAX_DAYS = int(os.getenv("COMMIT_STATS_MAX_DAYS", "30"))
+
+_RECORD_SEP = "\x1e"
+_FIELD_SEP = "\x1f"
+_LOG_FORMAT = f"{_RECORD_SEP}%H{_FIELD_SEP}%an{_FIELD_SEP}%at{_FIELD_SEP}%ct{_FIELD_SEP}%s"
+
+
+@dataclass(slots=True)
+class CommitRecord:
+    sha: str
+    author: str
+    authored_at: int
+    committed_at: int
+    subject: str
+    added: int = 0
+    deleted: int = 0
+    files: int = 0
+
+    @property
+    def churn(self) -> int:
+        return self.added + self.deleted
+
+
+def iter_commit_records(repo, rev: str) -> Iterator[CommitRecord]:
+    """Stream compact per-commit records, newest first, without building ``Commit`` objects."""
+    proc = subprocess.Popen(
+        ["git", "log", "--numstat", "--no-renames", f"--format={_LOG_FORMAT}", rev],
+        cwd=repo.git_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    current: CommitRecord | None = None
+    try:
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(_RECORD_SEP):
+                if current is not None:
+                    yield current
+                sha, author, at, ct, subject = line[1:].split(_FIELD_SEP, 4)
+                current = CommitRecord(sha, author, int(at), int(ct), subject)
+            elif line and current is not None:
+                added, deleted, _ = line.split("\t", 2)
+                # Binary files report "-" for both counts.
+                current.added += int(added) if added != "-" else 0
+                current.deleted += int(deleted) if deleted != "-" else 0
+                current.files += 1
+        if current is not None:
+            yield current
+    finally:
+        proc.stdout.close()
+        proc.kill()
+        proc.wait()
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+@dataclass
+class CommitStats:
+    """Aggregates over the full history, folded in one record at a time."""
+
+    total_commits: int = 0
+    total_added: int = 0
+    total_deleted: int = 0
+    first_commit_at: int | None = None
+    last_commit_at: int | None = None
+    authors: dict[str, dict[str, int]] = field(default_factory=dict)
+    commits_per_day: dict[str, int] = field(default_factory=dict)
+    commits_per_hour: list[int] = field(default_factory=lambda: [0] * 24)
+    recent: list[CommitRecord] = field(default_factory=list)
+    largest: list[CommitRecord] = field(default_factory=list)
+    after_deadline: list[CommitRecord] = field(default_factory=list)
+    after_deadline_count: int = 0
+    deadline: int | None = None
+
+    def add(self, c: CommitRecord):
+        self.total_commits += 1
+        self.total_added += c.added
+        self.total_deleted += c.deleted
+        if self.first_commit_at is None or c.committed_at < self.first_commit_at:
+            self.first_commit_at = c.committed_at
+        if self.last_commit_at is None or c.committed_at > self.last_commit_at:
+            self.last_commit_at = c.committed_at
+
+        author = self.authors.setdefault(c.author, {"commits": 0, "added": 0, "deleted": 0})
+        author["commits"] += 1
+        author["added"] += c.added
+        author["deleted"] += c.deleted
+
+        when = datetime.fromtimestamp(c.committed_at, timezone.utc)
+        day = when.date().isoformat()
+        self.commits_per_day[day] = self.commits_per_day.get(day, 0) + 1
+        self.commits_per_hour[when.hour] += 1
+
+        if len(self.recent) < RECENT_COMMITS:
+            self.recent.append(c)
+
+        # Keep only the biggest commits; mega-commit thresholds need the final total.
+        self.largest.append(c)
+        if len(self.largest) > MAX_LISTED * 2:
+            self.largest.sort(key=lambda r: -r.churn)
+            del self.largest[MAX_LISTED:]
+
+        if self.deadline is not None and c.committed_at > self.deadline:
+            self.after_deadline_count += 1
+            if len(self.after_deadline) < MAX_LISTED:
+                self.after_deadline.append(c)
+
+    @property
+    def mega_commits(self) -> list[CommitRecord]:
+        total = self.total_added + self.total_deleted
+        share_applies = self.total_commits >= MEGA_COMMIT_SHARE_MIN_COMMITS and total
+        return sorted(
+            (
+                c for c in self.largest
+                if c.churn >= MEGA_COMMIT_LINES
+                or (share_applies and c.churn >= MEGA_COMMIT_SHARE_MIN_LINES and c.churn / total >= MEGA_COMMIT_SHARE)
+            ),
+            key=lambda r: -r.churn,
+        )[:MAX_LISTED]
+
+    def to_dict(self) -> dict:
+        """JSON-ready summary, bounded in size however long the history is.
+
+        Only the top ``MAX_AUTHORS`` authors and the busiest ``MAX_DAYS`` days
+        are listed; ``other_authors`` and ``other_days`` total the rest.
+        """
+        def _brief(c: CommitRecord) -> dict:
+            return {
+                "sha": c.sha[:7],
+                "author": c.author,
+                "committed_at": _iso(c.committed_at),
+                "added": c.added,
+                "deleted": c.deleted,
+                "files": c.files,
+                "subject": c.subject[:80],
+            }
+
+        authors = sorted(self.authors.items(), key=lambda kv: (-kv[1]["commits"], kv[0]))
+        rest = [a for _, a in authors[MAX_AUTHORS:]]
+        busiest = sorted(self.commits_per_day.items(), key=lambda kv: (-kv[1], kv[0]))
+        quiet = busiest[MAX_DAYS:]
+
+        return {
+            "total_commits": self.total_commits,
+            "lines_added": self.total_added,
+            "lines_deleted": self.total_deleted,
+            "first_commit_at": _iso(self.first_commit_at) if self.first_commit_at is not None else None,
+            "last_commit_at": _iso(self.last_commit_at) if self.last_commit_at is not None else None,
+            "author_count": len(self.authors),
+            "authors": dict(authors[:MAX_AUTHORS]),
+            "other_authors": {
+                "authors": len(rest),
+                "commits": sum(a["commits"] for a in rest),
+                "added": sum(a["added"] for a in rest),
+                "deleted": sum(a["deleted"] for a in rest),
+            },
+            "active_days": len(self.commits_per_day),
+            "commits_per_day": dict(sorted(busiest[:MAX_DAYS])),
+            "other_days": {"days": len(quiet), "commits": sum(n for _, n in quiet)},
+            "commits_per_hour_utc": self.commits_per_hour,
+            "mega_commits": [_brief(c) for c in self.mega_commits],
+            "deadline": _iso(self.deadline) if self.deadline is not None else None,
+            "commits_after_deadline": self.after_deadline_count,
+            "after_deadline_examples": [_brief(c) for c in self.after_deadline],
+        }
+
+
+def parse_deadline(value: str | None) -> int | None:
+    """Parse an ISO-8601 deadline into a UTC timestamp; naive values are taken as UTC."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp())
+
+
+def collect_commit_stats(repo, rev: str, deadline: int | None = None) -> CommitStats:
+    stats = CommitStats(deadline=deadline)
+    for record in iter_commit_records(repo, rev):
+        stats.add(record)
+    return stats
@@ -0,0 +1,96 @@
+"""Read trees and blobs straight from a repository's object database."""
+
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator
+
+
+@dataclass
+class TreeEntry:
+    path: str
+    sha: str
+    size: int
+
+
+def list_tree(repo, rev: str) -> list[TreeEntry]:
+    """Regular files in ``rev`` with blob sizes, via ``git ls-tree -r -l``.
+
+    Symlinks are listed with their link size; submodules are omitted.
+    """
+    out = repo.git.ls_tree("-r", "-l", "-z", rev, strip_newline_in_stdout=False)
+    entries: list[TreeEntry] = []
+    for record in out.split("\0"):
+        if not record:
+            continue
+        meta, path = record.split("\t", 1)
+        mode, obj_type, sha, size = meta.split()
+        if obj_type != "blob":
+            continue
+        entries.append(TreeEntry(path=path, sha=sha, size=int(size) if size != "-" else 0))
+    return entries
+
+
+class BlobReader:
+    """File-like view over one object's bytes in a ``cat-file --batch`` stream."""
+
+    def __init__(self, stream: IO[bytes], size: int):
+        self._stream = stream
+        self.size = size
+        self.remaining = size
+
+    def read(self, n: int = -1) -> bytes:
+        if n < 0 or n > self.remaining:
+            n = self.remaining
+        data = self._stream.read(n) if n else b""
+        self.remaining -= len(data)
+        return data
+
+    def drain(self, chunk_size: int = 64 * 1024):
+        while self.remaining and self.read(chunk_size):
+            pass
+
+
+def iter_blobs(repo, shas: Iterable[str]) -> Iterator[tuple[str, BlobReader]]:
+    """Yield ``(sha, reader)`` for each blob using one ``git cat-file --batch`` process.
+
+    Contents are never buffered whole: the caller reads as much of each blob
+    as it needs and the rest is skipped before the next one is yielded.
+    Object ids are fed from a writer thread so large batches never deadlock
+    on full pipes.
+    """
+    proc = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=repo.git_dir,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    shas = list(shas)
+
+    def _feed():
+        try:
+            for sha in shas:
+                proc.stdin.write(f"{sha}\n".encode())
+            proc.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    writer = threading.Thread(target=_feed, daemon=True)
+    writer.start()
+    try:
+        for _ in shas:
+            header = proc.stdout.readline().split()
+            if len(header) < 3:
+                # "<sha> missing" — nothing follows on stdout for this object.
+                continue
+            reader = BlobReader(proc.stdout, int(header[2]))
+            yield header[0].decode(), reader
+            reader.drain()
+            proc.stdout.read(1)  # trailing LF
+    finally:
+        proc.stdout.close()
+        proc.kill()
+        proc.wait()
+        writer.join()
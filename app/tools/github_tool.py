@@ -1,16 +1,301 @@
 """Tool that clones a GitHub repo and analyzes its contents."""
 
+import io
+import json
 import os
-import shutil
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Type
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from app.compaction import CompactionReport, compact_for
+from app.tools.commit_stats import collect_commit_stats, parse_deadline
+from app.tools.git_objects import iter_blobs, list_tree
+from app.tools.line_counter import LineCount, count_lines
+from app.tools.repo_store import get_repo_store, normalize_url
+from app.tools.result_cache import ResultCache
+
+# Bump when the analysis text format changes so stale cache entries are ignored.
+ANALYSIS_VERSION = "9"
+
+# "objects" reads the HEAD tree from the object database; "worktree" checks it out to disk.
+ANALYSIS_MODE = os.getenv("GITHUB_ANALYSIS_MODE", "objects")
+
+EXCLUDED_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", ".next", "dist", "build"}
+KEY_FILES = ["README.md", "readme.md", "README.rst", "package.json", "requirements.txt", "pyproject.toml"]
+KEY_FILE_CHARS = 3000
+
+# Submission deadline (ISO-8601) used to flag late commits when the caller doesn't pass one.
+HACKATHON_DEADLINE = os.getenv("HACKATHON_DEADLINE", "")
+
+# Line counting reads at most this much per file and per repo; the rest is reported as skipped.
+MAX_FILE_BYTES = int(os.getenv("GITHUB_MAX_FILE_BYTES", str(5 * 1024 * 1024)))
+MAX_REPO_BYTES = int(os.getenv("GITHUB_MAX_REPO_BYTES", str(200 * 1024 * 1024)))
+
+TECH_INDICATORS = {
+    "package.json": "Node.js / JavaScript",
+    "requirements.txt": "Python (pip)",
+    "Pipfile": "Python (pipenv)",
+    "pyproject.toml": "Python (modern)",
+    "Cargo.toml": "Rust",
+    "go.mod": "Go",
+    "pom.xml": "Java (Maven)",
+    "build.gradle": "Java/Kotlin (Gradle)",
+    "Gemfile": "Ruby",
+    "docker-compose.yml": "Docker Compose",
+    "Dockerfile": "Docker",
+    ".env": "Environment variables",
+    "next.config.js": "Next.js",
+    "next.config.mjs": "Next.js",
+    "vite.config.ts": "Vite",
+    "tailwind.config.js": "Tailwind CSS",
+    "tailwind.config.ts": "Tailwind CSS",
+    "tsconfig.json": "TypeScript",
+    "angular.json": "Angular",
+    "vue.config.js": "Vue.js",
+    "flutter_app.yaml": "Flutter",
+    "pubspec.yaml": "Dart/Flutter",
+}
+
+QUALITY_FILES = [".eslintrc", ".eslintrc.json", ".prettier", ".prettierrc", "mypy.ini", "setup.cfg", ".flake8", "tox.ini", "jest.config", "pytest.ini", ".github/workflows"]
+CI_INDICATORS = [".github/workflows", "Jenkinsfile", ".gitlab-ci"]
+
+# Worker threads for the line-counting phase; 1 scans serially.
+SCAN_WORKERS = int(os.getenv("GITHUB_SCAN_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+SKIP_BINARY = "binary"
+SKIP_TOO_LARGE = "larger than per-file limit"
+SKIP_BUDGET = "over repo byte budget"
+
+_analysis_cache = ResultCache(
+    "github",
+    max_bytes=int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    max_age=float(os.getenv("GITHUB_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+)
+
+
+def _resolve_head(repo_url: str) -> str | None:
+    """Return the remote HEAD commit SHA via ``ls-remote`` without cloning."""
+    import git
+
+    try:
+        out = git.cmd.Git().ls_remote(repo_url, "HEAD")
+    except Exception:
+        return None
+    return out.split()[0] if out else None
+
+
+def _cache_key(repo_url: str, sha: str, deadline: int | None = None) -> str:
+    return f"v{ANALYSIS_VERSION}-{ANALYSIS_MODE}:{normalize_url(repo_url)}@{sha}#{deadline or ''}"
+
+
+def cache_stats() -> dict:
+    return _analysis_cache.stats()
+
+
+@dataclass
+class RepoScan:
+    """File-level facts about one revision, independent of how they were read."""
+
+    file_list: list[str] = field(default_factory=list)
+    ext_count: dict[str, int] = field(default_factory=dict)
+    total_lines: dict[str, int] = field(default_factory=dict)
+    key_contents: dict[str, str] = field(default_factory=dict)
+    skipped: dict[str, list[str]] = field(default_factory=dict)
+    bytes_scanned: int = 0
+
+    def add(self, path: str, lines: int):
+        self.file_list.append(path)
+        ext = os.path.splitext(path)[1].lower()
+        self.ext_count[ext] = self.ext_count.get(ext, 0) + 1
+        self.total_lines[ext] = self.total_lines.get(ext, 0) + lines
+
+    def skip(self, path: str, reason: str):
+        self.skipped.setdefault(reason, []).append(path)
+
+    def record(self, path: str, result: LineCount) -> int:
+        """Account for a counted file and return its line total (0 if binary)."""
+        if result.binary:
+            self.skip(path, SKIP_BINARY)
+            return 0
+        if _is_key_file(path):
+            self.key_contents[path] = result.head.decode("utf-8", errors="ignore")[:KEY_FILE_CHARS]
+        return result.lines
+
+
+_KEY_FILES_LOWER = frozenset(kf.lower() for kf in KEY_FILES)
+
+
+def _is_key_file(path: str) -> bool:
+    return path.lower() in _KEY_FILES_LOWER
+
+
+def _plan_budget(scan: RepoScan, sizes: dict[str, int]) -> list[str]:
+    """Pick which files to read, in path order, under the per-file and per-repo byte caps."""
+    budget = MAX_REPO_BYTES
+    selected = []
+    for path in sorted(sizes):
+        size = sizes[path]
+        if size > MAX_FILE_BYTES:
+            scan.skip(path, SKIP_TOO_LARGE)
+        elif size > budget:
+            scan.skip(path, SKIP_BUDGET)
+        else:
+            budget -= size
+            scan.bytes_scanned += size
+            selected.append(path)
+    return selected
+
+
+class FileIndex:
+    """Lookup tables over a file list, built in one pass so every detector is O(1).
+
+    * ``has_file`` matches a basename exactly or as a dotted suffix
+      (``Dockerfile`` also matches ``dev.Dockerfile``).
+    * ``has_config`` matches a basename, a dotted prefix (``jest.config``
+      matches ``jest.config.js``) or a run of trailing directory segments
+      (``.github/workflows``).
+    * ``find`` resolves a path case-insensitively.
+    """
+
+    def __init__(self, paths: list[str]):
+        self.basenames: set[str] = set()
+        self.suffixes: set[str] = set()
+        self.prefixes: set[str] = set()
+        self.dir_tails: set[str] = set()
+        self.by_lower_path: dict[str, str] = {}
+        self.has_tests = False
+
+        seen_dirs: set[str] = set()
+        for path in paths:
+            self.by_lower_path.setdefault(path.lower(), path)
+            if not self.has_tests and "test" in path.lower():
+                self.has_tests = True
+
+            dirname, _, base = path.rpartition("/")
+            self.basenames.add(base)
+            for i, ch in enumerate(base):
+                if ch == ".":
+                    if i:
+                        self.prefixes.add(base[:i])
+                    self.suffixes.add(base[i:])
+                    self.suffixes.add(base[i + 1:])
+
+            if dirname and dirname not in seen_dirs:
+                seen_dirs.add(dirname)
+                segments = dirname.split("/")
+                for i in range(len(segments)):
+                    self.dir_tails.add("/".join(segments[i:]))
+
+    def has_file(self, name: str) -> bool:
+        return name in self.basenames or name in self.suffixes
+
+    def has_config(self, name: str) -> bool:
+        return name in self.basenames or name in self.prefixes or name in self.dir_tails
+
+    def find(self, path: str) -> str | None:
+        return self.by_lower_path.get(path.lower())
+
+
+def _pool_map(fn, items: list, workers: int) -> list:
+    """``map`` over a thread pool, preserving input order so results merge deterministically."""
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def _strip_head(paths: list[str], result: LineCount) -> LineCount:
+    # Only key files need their preview; dropping the rest keeps pooled results small.
+    if not any(_is_key_file(p) for p in paths):
+        result.head = b""
+    return result
+
+
+def _scan_worktree(clone_dir: str, workers: int = SCAN_WORKERS) -> RepoScan:
+    scan = RepoScan()
+    sizes: dict[str, int] = {}
+    for root, dirs, files in os.walk(clone_dir):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        for f in files:
+            if f == ".git" and root == clone_dir:
+                continue  # worktree link file, not project content
+            rel = os.path.relpath(os.path.join(root, f), clone_dir).replace(os.sep, "/")
+            try:
+                # lstat, so a symlink is sized as its link path like its blob in objects mode.
+                sizes[rel] = os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                sizes[rel] = 0
+
+    def _count(rel: str) -> LineCount | None:
+        path = os.path.join(clone_dir, rel)
+        try:
+            if os.path.islink(path):
+                # Git stores a symlink as a blob holding its target path; count that,
+                # not the file it points at, so both scan modes agree.
+                return _strip_head([rel], count_lines(io.BytesIO(os.fsencode(os.readlink(path))).read))
+            with open(path, "rb") as fh:
+                return _strip_head([rel], count_lines(fh.read))
+        except OSError:
+            return None
+
+    selected = _plan_budget(scan, sizes)
+    lines_by_path: dict[str, int] = {}
+    for rel, result in zip(selected, _pool_map(_count, selected, workers)):
+        if result is not None:
+            lines_by_path[rel] = scan.record(rel, result)
+
+    for rel in sorted(sizes):
+        scan.add(rel, lines_by_path.get(rel, 0))
+    return scan
+
+
+def _scan_objects(repo, rev: str, workers: int = SCAN_WORKERS) -> RepoScan:
+    """Scan ``rev`` without a checkout: ``ls-tree`` for paths, ``cat-file --batch`` for contents.
+
+    Blobs are split into ``workers`` batches, each streamed by its own
+    ``cat-file`` process.
+    """
+    scan = RepoScan()
+    entries = {
+        e.path: e for e in list_tree(repo, rev)
+        if not any(part in EXCLUDED_DIRS for part in e.path.split("/")[:-1])
+    }
+    paths_by_sha: dict[str, list[str]] = {}
+    for path in _plan_budget(scan, {path: e.size for path, e in entries.items()}):
+        paths_by_sha.setdefault(entries[path].sha, []).append(path)
+
+    def _count(batch: list[str]) -> list[tuple[str, LineCount]]:
+        return [
+            (sha, _strip_head(paths_by_sha[sha], count_lines(reader.read)))
+            for sha, reader in iter_blobs(repo, batch)
+        ]
+
+    shas = list(paths_by_sha)
+    n = max(1, min(workers, len(shas)))
+    batches = [shas[i::n] for i in range(n)]
+
+    results = {sha: result for batch_results in _pool_map(_count, batches, n) for sha, result in batch_results}
+    # Record in path order so skip lists don't depend on how blobs were batched.
+    lines_by_path: dict[str, int] = {}
+    for path in sorted(p for paths in paths_by_sha.values() for p in paths):
+        result = results.get(entries[path].sha)
+        if result is not None:
+            lines_by_path[path] = scan.record(path, result)
+
+    for path in sorted(entries):
+        scan.add(path, lines_by_path.get(path, 0))
+    return scan
+
 
 class GitHubAnalysisInput(BaseModel):
     repo_url: str = Field(..., description="The GitHub repository URL to analyze")
+    deadline: str | None = Field(
+        None,
+        description="Optional submission deadline (ISO-8601); commits after it are flagged",
+    )
 
 
 class GitHubAnalysisTool(BaseTool):
@@ -21,134 +306,147 @@ class GitHubAnalysisTool(BaseTool):
         "README content, and architecture patterns."
     )
     args_schema: Type[BaseModel] = GitHubAnalysisInput
+    # Per-run budget and savings record; None compacts to the default budget unrecorded.
+    compaction: CompactionReport | None = None
 
-    def _run(self, repo_url: str) -> str:
-        import git
+    def _run(self, repo_url: str, deadline: str | None = None) -> str:
+        return compact_for("github", "repository analysis", self._report(repo_url, deadline), self.compaction)
 
-        clone_dir = tempfile.mkdtemp(prefix="hackathon_repo_")
-        try:
-            repo = git.Repo.clone_from(repo_url, clone_dir, depth=50)
-            analysis_parts: list[str] = []
-
-            # --- Commit history ---
-            commits = list(repo.iter_commits("HEAD", max_count=50))
-            analysis_parts.append(f"## Commit History ({len(commits)} commits fetched)")
-            unique_authors = {c.author.name for c in commits}
-            analysis_parts.append(f"Unique authors: {', '.join(unique_authors)}")
-            analysis_parts.append(f"Total commits (in shallow clone): {len(commits)}")
-            if commits:
-                first, last = commits[-1], commits[0]
-                analysis_parts.append(f"First commit: {first.committed_datetime}")
-                analysis_parts.append(f"Latest commit: {last.committed_datetime}")
-                analysis_parts.append("\nRecent commits:")
-                for c in commits[:10]:
-                    analysis_parts.append(f"  - {c.hexsha[:7]} {c.message.strip()[:80]}")
-
-            # --- File structure ---
-            analysis_parts.append("\n## File Structure")
-            file_list: list[str] = []
-            ext_count: dict[str, int] = {}
-            total_lines: dict[str, int] = {}
-            for root, dirs, files in os.walk(clone_dir):
-                dirs[:] = [d for d in dirs if d not in {".git", "node_modules", "__pycache__", ".venv", "venv", ".next", "dist", "build"}]
-                for f in files:
-                    rel = os.path.relpath(os.path.join(root, f), clone_dir)
-                    file_list.append(rel)
-                    ext = os.path.splitext(f)[1].lower()
-                    ext_count[ext] = ext_count.get(ext, 0) + 1
-                    try:
-                        with open(os.path.join(root, f), "r", encoding="utf-8", errors="ignore") as fh:
-                            lines = len(fh.readlines())
-                            total_lines[ext] = total_lines.get(ext, 0) + lines
-                    except Exception:
-                        pass
-
-            analysis_parts.append(f"Total files: {len(file_list)}")
-            analysis_parts.append("\nFile extensions breakdown:")
-            for ext, count in sorted(ext_count.items(), key=lambda x: -x[1])[:15]:
-                lines = total_lines.get(ext, 0)
-                analysis_parts.append(f"  {ext or '(no ext)'}: {count} files, ~{lines} lines")
-
-            if len(file_list) <= 60:
-                analysis_parts.append("\nFull file tree:")
-                for f in sorted(file_list):
-                    analysis_parts.append(f"  {f}")
-            else:
-                analysis_parts.append(f"\nFile tree too large ({len(file_list)} files), showing top-level:")
-                top_level = set()
-                for f in file_list:
-                    top_level.add(f.split(os.sep)[0])
-                for t in sorted(top_level):
-                    analysis_parts.append(f"  {t}/")
-
-            # --- Tech stack detection ---
-            analysis_parts.append("\n## Tech Stack Detection")
-            indicators = {
-                "package.json": "Node.js / JavaScript",
-                "requirements.txt": "Python (pip)",
-                "Pipfile": "Python (pipenv)",
-                "pyproject.toml": "Python (modern)",
-                "Cargo.toml": "Rust",
-                "go.mod": "Go",
-                "pom.xml": "Java (Maven)",
-                "build.gradle": "Java/Kotlin (Gradle)",
-                "Gemfile": "Ruby",
-                "docker-compose.yml": "Docker Compose",
-                "Dockerfile": "Docker",
-                ".env": "Environment variables",
-                "next.config.js": "Next.js",
-                "next.config.mjs": "Next.js",
-                "vite.config.ts": "Vite",
-                "tailwind.config.js": "Tailwind CSS",
-                "tailwind.config.ts": "Tailwind CSS",
-                "tsconfig.json": "TypeScript",
-                "angular.json": "Angular",
-                "vue.config.js": "Vue.js",
-                "flutter_app.yaml": "Flutter",
-                "pubspec.yaml": "Dart/Flutter",
-            }
-            detected = []
-            for indicator, tech in indicators.items():
-                if any(f.endswith(indicator) for f in file_list):
-                    detected.append(tech)
-            if detected:
-                analysis_parts.append(f"Detected: {', '.join(detected)}")
-            else:
-                analysis_parts.append("No common framework indicators detected.")
-
-            # --- Key file contents ---
-            analysis_parts.append("\n## Key File Contents")
-            key_files = ["README.md", "readme.md", "README.rst", "package.json", "requirements.txt", "pyproject.toml"]
-            for kf in key_files:
-                matches = [f for f in file_list if f.lower() == kf.lower()]
-                if matches:
-                    fpath = os.path.join(clone_dir, matches[0])
-                    try:
-                        with open(fpath, "r", encoding="utf-8", errors="ignore") as fh:
-                            content = fh.read(3000)
-                        analysis_parts.append(f"\n### {matches[0]}")
-                        analysis_parts.append(content)
-                    except Exception:
-                        pass
-
-            # --- Code quality signals ---
-            analysis_parts.append("\n## Code Quality Signals")
-            quality_files = [".eslintrc", ".eslintrc.json", ".prettier", ".prettierrc", "mypy.ini", "setup.cfg", ".flake8", "tox.ini", "jest.config", "pytest.ini", ".github/workflows"]
-            found_quality = [q for q in quality_files if any(q in f for f in file_list)]
-            if found_quality:
-                analysis_parts.append(f"Quality tools found: {', '.join(found_quality)}")
-            else:
-                analysis_parts.append("No linting/testing config files detected.")
-
-            has_tests = any("test" in f.lower() for f in file_list)
-            analysis_parts.append(f"Test files present: {has_tests}")
-
-            has_ci = any(".github/workflows" in f or "Jenkinsfile" in f or ".gitlab-ci" in f for f in file_list)
-            analysis_parts.append(f"CI/CD config present: {has_ci}")
-
-            return "\n".join(analysis_parts)
+    def _report(self, repo_url: str, deadline: str | None = None) -> str:
+        """Full analysis of the repo's HEAD, from the cache when HEAD is unchanged."""
+        deadline_ts = parse_deadline(deadline or HACKATHON_DEADLINE)
+        head = _resolve_head(repo_url)
+        if head:
+            cached = _analysis_cache.get(_cache_key(repo_url, head, deadline_ts))
+            if cached is not None:
+                return cached
+
+        analysis, analyzed_sha = self._analyze(repo_url, deadline_ts)
+        if analyzed_sha:
+            # Key on the commit actually analyzed, in case HEAD moved since ls-remote.
+            _analysis_cache.put(_cache_key(repo_url, analyzed_sha, deadline_ts), analysis)
+        return analysis
 
+    def _analyze(self, repo_url: str, deadline: int | None = None) -> tuple[str, str | None]:
+        """Sync the mirror for ``repo_url`` and analyze its HEAD.
+
+        Returns the report and the analyzed HEAD SHA (None on error).
+        """
+        store = get_repo_store()
+        try:
+            if ANALYSIS_MODE == "worktree":
+                with store.worktree(repo_url) as (repo, clone_dir, head_sha):
+                    return self._build_report(repo, head_sha, _scan_worktree(clone_dir), deadline), head_sha
+            repo, head_sha = store.sync(repo_url)
+            return self._build_report(repo, head_sha, _scan_objects(repo, head_sha), deadline), head_sha
         except Exception as e:
-            return f"Error analyzing repository: {str(e)}"
-        finally:
-            shutil.rmtree(clone_dir, ignore_errors=True)
+            return f"Error analyzing repository: {str(e)}", None
+
+    def _build_report(self, repo, head_sha: str, scan: RepoScan, deadline: int | None = None) -> str:
+        analysis_parts: list[str] = []
+
+        # --- Commit history ---
+        stats = collect_commit_stats(repo, head_sha, deadline)
+        history = stats.to_dict()
+        analysis_parts.append(f"## Commit History ({stats.total_commits} commits, full history)")
+        others = history["other_authors"]
+        listed = ", ".join(history["authors"]) + (f", and {others['authors']} more" if others["authors"] else "")
+        analysis_parts.append(f"Unique authors ({history['author_count']}): {listed}")
+        analysis_parts.append(f"Total commits: {stats.total_commits}")
+        if stats.total_commits:
+            analysis_parts.append(f"First commit: {history['first_commit_at']}")
+            analysis_parts.append(f"Latest commit: {history['last_commit_at']}")
+            analysis_parts.append(f"Lines added/deleted: +{stats.total_added} / -{stats.total_deleted}")
+            analysis_parts.append(f"Active days: {history['active_days']}")
+            analysis_parts.append("\nPer-author churn:")
+            for name, a in history["authors"].items():
+                analysis_parts.append(f"  - {name}: {a['commits']} commits, +{a['added']} / -{a['deleted']}")
+            if others["authors"]:
+                analysis_parts.append(
+                    f"  - {others['authors']} other authors: {others['commits']} commits, "
+                    f"+{others['added']} / -{others['deleted']}"
+                )
+            if history["mega_commits"]:
+                analysis_parts.append("\nMega-commits:")
+                for c in history["mega_commits"]:
+                    analysis_parts.append(f"  - {c['sha']} +{c['added']} / -{c['deleted']} in {c['files']} files: {c['subject']}")
+            if stats.deadline is not None:
+                analysis_parts.append(f"\nCommits after deadline ({history['deadline']}): {stats.after_deadline_count}")
+                for c in history["after_deadline_examples"]:
+                    analysis_parts.append(f"  - {c['sha']} at {c['committed_at']}: {c['subject']}")
+            analysis_parts.append("\nRecent commits:")
+            for c in stats.recent:
+                analysis_parts.append(f"  - {c.sha[:7]} {c.subject[:80]}")
+            analysis_parts.append("\nCommit analytics (structured, cite by field name):")
+            analysis_parts.append(f"```json\n{json.dumps(history)}\n```")
+
+        # --- File structure ---
+        analysis_parts.append("\n## File Structure")
+        file_list = scan.file_list
+        ext_count = scan.ext_count
+        total_lines = scan.total_lines
+        analysis_parts.append(f"Total files: {len(file_list)}")
+        analysis_parts.append("\nFile extensions breakdown:")
+        for ext, count in sorted(ext_count.items(), key=lambda x: (-x[1], x[0]))[:15]:
+            lines = total_lines.get(ext, 0)
+            analysis_parts.append(f"  {ext or '(no ext)'}: {count} files, ~{lines} lines")
+
+        if scan.skipped:
+            analysis_parts.append(
+                f"\nLine counts exclude these files ({scan.bytes_scanned} of {MAX_REPO_BYTES} byte budget used):"
+            )
+            for reason in (SKIP_BINARY, SKIP_TOO_LARGE, SKIP_BUDGET):
+                paths = scan.skipped.get(reason)
+                if not paths:
+                    continue
+                examples = ", ".join(sorted(paths)[:5])
+                analysis_parts.append(f"  {reason}: {len(paths)} files (e.g. {examples})")
+
+        if len(file_list) <= 60:
+            analysis_parts.append("\nFull file tree:")
+            for f in sorted(file_list):
+                analysis_parts.append(f"  {f}")
+        else:
+            analysis_parts.append(f"\nFile tree too large ({len(file_list)} files), showing top-level:")
+            top_level = set()
+            for f in file_list:
+                top_level.add(f.split("/")[0])
+            for t in sorted(top_level):
+                analysis_parts.append(f"  {t}/")
+
+        # --- Tech stack detection ---
+        analysis_parts.append("\n## Tech Stack Detection")
+        index = FileIndex(file_list)
+        detected = []
+        for indicator, tech in TECH_INDICATORS.items():
+            if index.has_file(indicator) and tech not in detected:
+                detected.append(tech)
+        if detected:
+            analysis_parts.append(f"Detected: {', '.join(detected)}")
+        else:
+            analysis_parts.append("No common framework indicators detected.")
+
+        # --- Key file contents ---
+        analysis_parts.append("\n## Key File Contents")
+        shown: set[str] = set()
+        for kf in KEY_FILES:
+            match = index.find(kf)
+            if match and match not in shown and match in scan.key_contents:
+                shown.add(match)
+                analysis_parts.append(f"\n### {match}")
+                analysis_parts.append(scan.key_contents[match])
+
+        # --- Code quality signals ---
+        analysis_parts.append("\n## Code Quality Signals")
+        found_quality = [q for q in QUALITY_FILES if index.has_config(q)]
+        if found_quality:
+            analysis_parts.append(f"Quality tools found: {', '.join(found_quality)}")
+        else:
+            analysis_parts.append("No linting/testing config files detected.")
+
+        analysis_parts.append(f"Test files present: {index.has_tests}")
+
+        has_ci = any(index.has_config(c) for c in CI_INDICATORS)
+        analysis_parts.append(f"CI/CD config present: {has_ci}")
+
+        return "\n".join(analysis_parts)
@@ -0,0 +1,47 @@
+"""Bounded-memory line counting over byte streams."""
+
+from dataclasses import dataclass
+from typing import Callable
+
+CHUNK_SIZE = 64 * 1024
+
+# Same heuristic git uses: a NUL byte in the first 8000 bytes means binary.
+SNIFF_BYTES = 8000
+
+
+@dataclass
+class LineCount:
+    lines: int
+    binary: bool
+    head: bytes = b""
+
+
+def is_binary(head: bytes) -> bool:
+    return b"\0" in head[:SNIFF_BYTES]
+
+
+def count_lines(read: Callable[[int], bytes], chunk_size: int = CHUNK_SIZE) -> LineCount:
+    """Count lines by reading fixed-size chunks from ``read`` until it returns ``b""``.
+
+    Only one chunk is held at a time. If the first chunk looks binary, reading
+    stops there. A final line without a trailing newline still counts, matching
+    ``len(f.readlines())``. ``head`` is the first chunk, for callers that also
+    want a preview of the content.
+    """
+    head = read(chunk_size)
+    if not head:
+        return LineCount(lines=0, binary=False)
+    if is_binary(head):
+        return LineCount(lines=0, binary=True, head=head)
+
+    lines = head.count(b"\n")
+    last = head[-1:]
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        lines += chunk.count(b"\n")
+        last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    return LineCount(lines=lines, binary=False, head=head)
@@ -0,0 +1,168 @@
+"""Read pitch-deck content straight from the .pptx zip, without python-pptx's object model.
+
+Only the presentation, slide and notes-slide XML parts are opened; media is
+never read. The output is line-for-line what ``PPTXAnalysisTool`` produced
+with python-pptx: notes, then each top-level shape's text, table rows,
+picture and chart markers, in document order.
+"""
+
+import posixpath
+import zipfile
+from xml.etree import ElementTree as ET
+
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_RT_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_RT_NOTES_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+_URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+_URI_CHART = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+
+# Children of p:spTree that python-pptx treats as shapes.
+_SHAPE_TAGS = {f"{_P}sp", f"{_P}grpSp", f"{_P}graphicFrame", f"{_P}cxnSp", f"{_P}pic", f"{_P}contentPart"}
+_TEXT_RUN_TAGS = {f"{_A}r", f"{_A}fld"}
+
+
+def _rels(zf: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """Relationships of ``part`` as ``{rId: (type, target part name)}``."""
+    directory, name = posixpath.split(part)
+    try:
+        with zf.open(posixpath.join(directory, "_rels", f"{name}.rels")) as f:
+            root = ET.parse(f).getroot()
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(f"{_REL}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get("Id")] = (rel.get("Type"), target)
+    return rels
+
+
+def _parse(zf: zipfile.ZipFile, part: str) -> ET.Element:
+    with zf.open(part) as f:
+        return ET.parse(f).getroot()
+
+
+def _paragraph_text(p: ET.Element) -> str:
+    # Runs and fields contribute their text; a soft line break is "\v", as in python-pptx.
+    out = []
+    for child in p:
+        if child.tag in _TEXT_RUN_TAGS:
+            t = child.find(f"{_A}t")
+            out.append((t.text or "") if t is not None else "")
+        elif child.tag == f"{_A}br":
+            out.append("\v")
+    return "".join(out)
+
+
+def frame_text(tx_body: ET.Element | None) -> str:
+    if tx_body is None:
+        return ""
+    return "\n".join(_paragraph_text(p) for p in tx_body.findall(f"{_A}p"))
+
+
+def _shape_elements(root: ET.Element) -> list[ET.Element]:
+    tree = root.find(f"{_P}cSld/{_P}spTree")
+    return [] if tree is None else [e for e in tree if e.tag in _SHAPE_TAGS]
+
+
+def _nv_props(elm: ET.Element) -> ET.Element | None:
+    # The first child is always the non-visual properties (p:nvSpPr, p:nvPicPr, ...).
+    return elm[0] if len(elm) else None
+
+
+def _placeholder(elm: ET.Element) -> ET.Element | None:
+    nv = _nv_props(elm)
+    return None if nv is None else nv.find(f"{_P}nvPr/{_P}ph")
+
+
+def _shape_name(elm: ET.Element) -> str:
+    nv = _nv_props(elm)
+    c_nv_pr = None if nv is None else nv.find(f"{_P}cNvPr")
+    return "" if c_nv_pr is None else c_nv_pr.get("name", "")
+
+
+def _notes_text(zf: zipfile.ZipFile, notes_part: str) -> str:
+    for elm in _shape_elements(_parse(zf, notes_part)):
+        ph = _placeholder(elm)
+        if ph is not None and ph.get("type", "obj") == "body":
+            return frame_text(elm.find(f"{_P}txBody")) if elm.tag == f"{_P}sp" else ""
+    return ""
+
+
+def list_slides(zf: zipfile.ZipFile) -> tuple[str, list[str]]:
+    """The presentation part name and its slide part names, in deck order."""
+    package_rels = _rels(zf, "")
+    presentation = next(target for rel_type, target in package_rels.values() if rel_type == _RT_OFFICE_DOCUMENT)
+    rels = _rels(zf, presentation)
+    root = _parse(zf, presentation)
+    slides = [rels[sld_id.get(f"{_R}id")][1] for sld_id in root.iterfind(f"{_P}sldIdLst/{_P}sldId")]
+    return presentation, slides
+
+
+def slide_size(zf: zipfile.ZipFile, presentation: str) -> tuple[int | None, int | None]:
+    size = _parse(zf, presentation).find(f"{_P}sldSz")
+    if size is None:
+        return None, None
+    return int(size.get("cx")), int(size.get("cy"))
+
+
+def extract_slide(zf: zipfile.ZipFile, part: str, number: int) -> list[str]:
+    """Output lines for one slide; independent of every other slide."""
+    lines = [f"\n### Slide {number}"]
+
+    notes_part = next((t for rel_type, t in _rels(zf, part).values() if rel_type == _RT_NOTES_SLIDE), None)
+    if notes_part:
+        notes = _notes_text(zf, notes_part).strip()
+        if notes:
+            lines.append(f"Speaker Notes: {notes}")
+
+    shapes = _shape_elements(_parse(zf, part))
+    title = next((e for e in shapes if (ph := _placeholder(e)) is not None and int(ph.get("idx", "0")) == 0), None)
+
+    for elm in shapes:
+        if elm.tag == f"{_P}sp":
+            text = frame_text(elm.find(f"{_P}txBody")).strip()
+            if text:
+                lines.append(f"**Title:** {text}" if elm is title else f"Text: {text}")
+
+        elif elm.tag == f"{_P}graphicFrame":
+            data = elm.find(f"{_A}graphic/{_A}graphicData")
+            uri = None if data is None else data.get("uri")
+            if uri == _URI_TABLE:
+                lines.append("Table:")
+                for row_idx, row in enumerate(data.iterfind(f"{_A}tbl/{_A}tr")):
+                    cells = [frame_text(tc.find(f"{_A}txBody")).strip() for tc in row.iterfind(f"{_A}tc")]
+                    lines.append(f"  Row {row_idx}: {' | '.join(cells)}")
+            elif uri == _URI_CHART:
+                lines.append(f"[Chart: {_shape_name(elm)}]")
+
+        elif elm.tag == f"{_P}pic":
+            nv = _nv_props(elm)
+            is_movie = nv is not None and nv.find(f"{_P}nvPr/{_A}videoFile") is not None
+            if _placeholder(elm) is None and not is_movie:
+                ext = elm.find(f"{_P}spPr/{_A}xfrm/{_A}ext")
+                cx = ext.get("cx") if ext is not None else None
+                cy = ext.get("cy") if ext is not None else None
+                cx, cy = (int(cx) if cx is not None else None), (int(cy) if cy is not None else None)
+                lines.append(f"[Image: {_shape_name(elm)}, {cx}x{cy} EMUs]")
+
+    return lines
+
+
+def extract_deck(path: str) -> str:
+    """Extract every slide of the deck at ``path``, in slide order."""
+    with zipfile.ZipFile(path) as zf:
+        presentation, slides = list_slides(zf)
+        parts = ["## PowerPoint Analysis", f"Total slides: {len(slides)}"]
+        width, height = slide_size(zf, presentation)
+        if width and height:
+            parts.append(f"Slide dimensions: {width} x {height} EMUs")
+        for number, part in enumerate(slides, 1):
+            parts.extend(extract_slide(zf, part, number))
+    return "\n".join(parts)
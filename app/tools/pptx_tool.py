@@ -1,10 +1,30 @@
 """Tool that parses a PowerPoint (.pptx) file and extracts structured content."""
 
+import os
 from typing import Type
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from app.compaction import CompactionReport, compact_for
+from app.tools.pptx_extract import extract_deck
+from app.tools.result_cache import ResultCache, file_sha256
+
+# "zip" reads slide XML directly; "python-pptx" is the original object-model path.
+PPTX_ENGINE = os.getenv("PPTX_ENGINE", "zip")
+# Bump when the extracted text format changes so cached decks are re-parsed.
+EXTRACT_VERSION = "1"
+
+_extract_cache = ResultCache(
+    "pptx",
+    max_bytes=int(os.getenv("PPTX_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    max_age=float(os.getenv("PPTX_CACHE_MAX_AGE", str(30 * 24 * 3600))),
+)
+
+
+def cache_stats() -> dict:
+    return _extract_cache.stats()
+
 
 class PPTXAnalysisInput(BaseModel):
     file_path: str = Field(..., description="Absolute path to the .pptx file")
@@ -18,53 +38,71 @@ class PPTXAnalysisTool(BaseTool):
         "Returns a structured text representation of the entire deck."
     )
     args_schema: Type[BaseModel] = PPTXAnalysisInput
+    compaction: CompactionReport | None = None
 
     def _run(self, file_path: str) -> str:
-        from pptx import Presentation
-        from pptx.enum.shapes import MSO_SHAPE_TYPE
+        return compact_for("ppt", "pitch deck", self._extract(file_path), self.compaction)
 
+    def _extract(self, file_path: str) -> str:
         try:
-            prs = Presentation(file_path)
-            parts: list[str] = []
-            parts.append(f"## PowerPoint Analysis")
-            parts.append(f"Total slides: {len(prs.slides)}")
-
-            width = prs.slide_width
-            height = prs.slide_height
-            if width and height:
-                parts.append(f"Slide dimensions: {width} x {height} EMUs")
-
-            for idx, slide in enumerate(prs.slides, 1):
-                parts.append(f"\n### Slide {idx}")
-
-                if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-                    notes = slide.notes_slide.notes_text_frame.text.strip()
-                    if notes:
-                        parts.append(f"Speaker Notes: {notes}")
-
-                for shape in slide.shapes:
-                    if shape.has_text_frame:
-                        text = shape.text_frame.text.strip()
-                        if text:
-                            if shape == slide.shapes.title:
-                                parts.append(f"**Title:** {text}")
-                            else:
-                                parts.append(f"Text: {text}")
-
-                    if shape.has_table:
-                        table = shape.table
-                        parts.append("Table:")
-                        for row_idx, row in enumerate(table.rows):
-                            cells = [cell.text.strip() for cell in row.cells]
-                            parts.append(f"  Row {row_idx}: {' | '.join(cells)}")
-
-                    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                        parts.append(f"[Image: {shape.name}, {shape.width}x{shape.height} EMUs]")
-
-                    if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                        parts.append(f"[Chart: {shape.name}]")
-
-            return "\n".join(parts)
+            key = f"v{EXTRACT_VERSION}:{file_sha256(file_path)}"
+        except OSError as e:
+            return f"Error parsing PowerPoint file: {str(e)}"
+        cached = _extract_cache.get(key)
+        if cached is not None:
+            return cached
 
+        try:
+            text = extract_deck(file_path) if PPTX_ENGINE == "zip" else extract_with_python_pptx(file_path)
         except Exception as e:
             return f"Error parsing PowerPoint file: {str(e)}"
+        _extract_cache.put(key, text)
+        return text
+
+
+def extract_with_python_pptx(file_path: str) -> str:
+    """Reference extraction through python-pptx's object model (slower, same output)."""
+    from pptx import Presentation
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    prs = Presentation(file_path)
+    parts: list[str] = []
+    parts.append(f"## PowerPoint Analysis")
+    parts.append(f"Total slides: {len(prs.slides)}")
+
+    width = prs.slide_width
+    height = prs.slide_height
+    if width and height:
+        parts.append(f"Slide dimensions: {width} x {height} EMUs")
+
+    for idx, slide in enumerate(prs.slides, 1):
+        parts.append(f"\n### Slide {idx}")
+
+        if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
+            notes = slide.notes_slide.notes_text_frame.text.strip()
+            if notes:
+                parts.append(f"Speaker Notes: {notes}")
+
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                text = shape.text_frame.text.strip()
+                if text:
+                    if shape == slide.shapes.title:
+                        parts.append(f"**Title:** {text}")
+                    else:
+                        parts.append(f"Text: {text}")
+
+            if shape.has_table:
+                table = shape.table
+                parts.append("Table:")
+                for row_idx, row in enumerate(table.rows):
+                    cells = [cell.text.strip() for cell in row.cells]
+                    parts.append(f"  Row {row_idx}: {' | '.join(cells)}")
+
+            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                parts.append(f"[Image: {shape.name}, {shape.width}x{shape.height} EMUs]")
+
+            if shape.shape_type == MSO_SHAPE_TYPE.CHART:
+                parts.append(f"[Chart: {shape.name}]")
+
+    return "\n".join(parts)
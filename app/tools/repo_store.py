@@ -0,0 +1,113 @@
+"""Persistent store of bare repository mirrors, updated by incremental fetch."""
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.tools.result_cache import CACHE_DIR, ResultCache
+
+REPO_STORE_DIR = os.getenv("REPO_STORE_DIR", os.path.join(CACHE_DIR, "repos"))
+
+# Remote HEAD is fetched into this ref so analysis follows the default branch.
+HEAD_REF = "refs/judge/head"
+FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", f"+HEAD:{HEAD_REF}"]
+
+
+def normalize_url(repo_url: str) -> str:
+    url = repo_url.strip().rstrip("/")
+    return url[:-4] if url.endswith(".git") else url
+
+
+class RepoStore:
+    """One bare repo per remote. First use clones; later uses only fetch new objects."""
+
+    def __init__(self, root: str = REPO_STORE_DIR):
+        self.root = root
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def mirror_path(self, repo_url: str) -> str:
+        return os.path.join(self.root, f"{ResultCache.make_key(normalize_url(repo_url))[:32]}.git")
+
+    def sync(self, repo_url: str):
+        """Clone or fetch the mirror for ``repo_url``. Returns ``(bare_repo, head_sha)``."""
+        import git
+
+        path = self.mirror_path(repo_url)
+        with self._lock_for(path):
+            repo = None
+            if os.path.isdir(path):
+                try:
+                    repo = git.Repo(path)
+                except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                    repo = None
+                if repo is not None:
+                    try:
+                        repo.git.fetch("--prune", "--no-tags", repo_url, *FETCH_REFSPECS)
+                    except git.GitCommandError:
+                        # Usually the remote (network, auth, rate limit): keep the history and fail.
+                        if self._is_intact(repo):
+                            raise
+                        repo = None
+                if repo is None:
+                    # A corrupt or half-written mirror is cheaper to rebuild than to repair.
+                    shutil.rmtree(path, ignore_errors=True)
+            if repo is None:
+                os.makedirs(self.root, exist_ok=True)
+                tmp = tempfile.mkdtemp(prefix="mirror_", dir=self.root)
+                try:
+                    repo = git.Repo.init(tmp, bare=True)
+                    repo.git.fetch("--no-tags", repo_url, *FETCH_REFSPECS)
+                    os.replace(tmp, path)
+                except Exception:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise
+                repo = git.Repo(path)
+            return repo, repo.git.rev_parse(HEAD_REF)
+
+    @staticmethod
+    def _is_intact(repo) -> bool:
+        """Whether the mirror's last fetched HEAD and everything it reaches are readable."""
+        import git
+
+        try:
+            repo.git.rev_parse("--verify", "--quiet", f"{HEAD_REF}^{{commit}}")
+            repo.git.fsck("--connectivity-only", "--no-dangling")
+        except git.GitCommandError:
+            return False
+        return True
+
+    @contextmanager
+    def worktree(self, repo_url: str) -> Iterator[tuple]:
+        """Yield ``(bare_repo, worktree_dir, head_sha)`` for a detached checkout of remote HEAD."""
+        repo, sha = self.sync(repo_url)
+        work_dir = tempfile.mkdtemp(prefix="hackathon_repo_")
+        lock = self._lock_for(self.mirror_path(repo_url))
+        try:
+            with lock:
+                repo.git.worktree("add", "--force", "--detach", work_dir, sha)
+            yield repo, work_dir, sha
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            with lock:
+                try:
+                    repo.git.worktree("prune")
+                except Exception:
+                    pass
+
+
+_store: RepoStore | None = None
+
+
+def get_repo_store() -> RepoStore:
+    global _store
+    if _store is None:
+        _store = RepoStore()
+    return _store
@@ -0,0 +1,153 @@
+"""Persistent on-disk cache for expensive tool results."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.getenv(
+    "JUDGE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache"),
+)
+
+_hash_lock = threading.Lock()
+_hash_memo: dict[tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: str) -> str:
+    """Chunked SHA-256 of a file, memoised on (path, size, mtime)."""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _hash_lock:
+        cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    remember_sha256(path, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def remember_sha256(path: str, sha256: str):
+    """Seed the memo when the hash is already known, e.g. from a streamed upload."""
+    st = os.stat(path)
+    with _hash_lock:
+        if len(_hash_memo) > 1024:
+            _hash_memo.clear()
+        _hash_memo[(os.path.abspath(path), st.st_size, st.st_mtime_ns)] = sha256
+
+
+class ResultCache:
+    """Content-addressed text cache with age- and size-based eviction.
+
+    Each entry is a small JSON file named after the SHA-256 of its key. Reads
+    refresh the file's mtime, so ``max_age`` counts from last use and size
+    eviction drops the least recently used entries first. With
+    ``refresh_on_read=False`` the mtime stays at write time, so ``max_age``
+    is a hard lifetime for entries that mirror something expiring elsewhere.
+    Hit/miss counters are kept per instance.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 7 * 24 * 3600,
+        refresh_on_read: bool = True,
+    ):
+        self.directory = os.path.join(CACHE_DIR, namespace)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.refresh_on_read = refresh_on_read
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{self.make_key(key)}.json")
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a live entry exists, without touching it or the hit counters."""
+        try:
+            return time.time() - os.path.getmtime(self._path(key)) <= self.max_age
+        except OSError:
+            return False
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("key") != key or time.time() - os.path.getmtime(path) > self.max_age:
+                raise KeyError(key)
+            if self.refresh_on_read:
+                os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def put(self, key: str, value: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "created_at": time.time(), "value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used until under ``max_bytes``."""
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.directory) if n.endswith(".json")]
+            except OSError:
+                return
+            now = time.time()
+            entries = []
+            for name in names:
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    _remove(path)
+                else:
+                    entries.append((st.st_mtime, st.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                _remove(path)
+                total -= size
+
+    def stats(self) -> dict:
+        entries = 0
+        size = 0
+        try:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(self.directory, name))
+        except OSError:
+            pass
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
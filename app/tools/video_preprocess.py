@@ -0,0 +1,171 @@
+"""Shrink demo videos with ffmpeg before they are uploaded to Gemini.
+
+Transcodes are capped in resolution, frame rate, bitrate and duration, and
+cached under ``TRANSCODE_DIR`` by source SHA-256 plus a signature of the
+settings. When ffmpeg is missing or fails, the original file is used.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+
+from app.tools.result_cache import CACHE_DIR
+
+PREPROCESS_ENABLED = os.getenv("VIDEO_PREPROCESS", "true").lower() not in ("0", "false", "no")
+MAX_HEIGHT = int(os.getenv("VIDEO_MAX_HEIGHT", "720"))
+MAX_FPS = int(os.getenv("VIDEO_MAX_FPS", "10"))
+MAX_BITRATE = os.getenv("VIDEO_MAX_BITRATE", "1M")
+MAX_DURATION_SECONDS = int(os.getenv("VIDEO_MAX_DURATION_SECONDS", "300"))
+# Optional 4x4 grid of evenly spaced frames, sent alongside the video.
+KEYFRAME_MONTAGE = os.getenv("VIDEO_KEYFRAME_MONTAGE", "false").lower() in ("1", "true", "yes")
+MONTAGE_GRID = 4
+TRANSCODE_TIMEOUT_SECONDS = float(os.getenv("VIDEO_TRANSCODE_TIMEOUT_SECONDS", "600"))
+TRANSCODE_MAX_BYTES = int(os.getenv("VIDEO_TRANSCODE_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
+TRANSCODE_DIR = os.path.join(CACHE_DIR, "video_transcodes")
+
+_locks_guard = threading.Lock()
+_locks: dict[str, threading.Lock] = {}
+
+
+@dataclass(frozen=True)
+class PreparedVideo:
+    path: str
+    # Identity of what gets uploaded: source hash, plus settings if transcoded.
+    key: str
+    transcoded: bool = False
+    montage_path: str | None = None
+    error: str | None = None
+
+
+def settings_signature() -> str:
+    settings = f"{MAX_HEIGHT}:{MAX_FPS}:{MAX_BITRATE}:{MAX_DURATION_SECONDS}"
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()[:12]
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which(FFMPEG_BIN) is not None
+
+
+def preprocess_signature() -> str:
+    """Describes what ``preprocess_video`` currently produces, for analysis cache keys."""
+    if not PREPROCESS_ENABLED or not ffmpeg_available():
+        return "raw"
+    return settings_signature() + ("+montage" if KEYFRAME_MONTAGE else "")
+
+
+def prepared_signature(prepared: PreparedVideo) -> str:
+    """Describes what was actually uploaded, in the same terms as ``preprocess_signature``."""
+    if not prepared.transcoded:
+        return "raw"
+    return settings_signature() + ("+montage" if prepared.montage_path else "")
+
+
+def transcode_command(source: str, target: str) -> list[str]:
+    return [
+        FFMPEG_BIN, "-nostdin", "-y", "-v", "error",
+        "-i", source,
+        "-t", str(MAX_DURATION_SECONDS),
+        "-vf", f"scale=-2:'min({MAX_HEIGHT},ih)'",
+        "-fpsmax", str(MAX_FPS),
+        "-c:v", "libx264", "-preset", "veryfast",
+        "-b:v", MAX_BITRATE, "-maxrate", MAX_BITRATE, "-bufsize", MAX_BITRATE,
+        "-c:a", "aac", "-b:a", "64k", "-ac", "1",
+        "-movflags", "+faststart",
+        "-f", "mp4", target,
+    ]
+
+
+def montage_command(source: str, target: str, duration: float) -> list[str]:
+    frames = MONTAGE_GRID * MONTAGE_GRID
+    return [
+        FFMPEG_BIN, "-nostdin", "-y", "-v", "error",
+        "-i", source,
+        "-vf", f"fps={frames}/{duration:.3f},scale=320:-2,tile={MONTAGE_GRID}x{MONTAGE_GRID}",
+        "-frames:v", "1", "-update", "1",
+        "-c:v", "mjpeg", "-f", "image2", target,
+    ]
+
+
+def probe_duration(path: str) -> float | None:
+    try:
+        out = subprocess.run(
+            [FFPROBE_BIN, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            capture_output=True, text=True, timeout=60, check=True,
+        ).stdout
+        return float(out.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def _run_to(command_for, target: str):
+    """Run the ffmpeg command built by ``command_for(tmp)`` and move its output into place."""
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        subprocess.run(command_for(tmp), capture_output=True, timeout=TRANSCODE_TIMEOUT_SECONDS, check=True)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _evict():
+    """Drop the least recently used transcodes once the directory exceeds its budget."""
+    try:
+        entries = [os.path.join(TRANSCODE_DIR, n) for n in os.listdir(TRANSCODE_DIR) if not n.endswith(".tmp")]
+        stats = sorted((os.stat(p).st_mtime, os.stat(p).st_size, p) for p in entries)
+    except OSError:
+        return
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in stats:
+        if total <= TRANSCODE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def preprocess_video(source: str, source_sha: str) -> PreparedVideo:
+    """Return the file to upload for ``source``, transcoding it on first use. Blocking."""
+    if not PREPROCESS_ENABLED:
+        return PreparedVideo(source, source_sha)
+    if not ffmpeg_available():
+        return PreparedVideo(source, source_sha, error=f"{FFMPEG_BIN} not found; uploading the original")
+
+    key = f"{source_sha}-{settings_signature()}"
+    target = os.path.join(TRANSCODE_DIR, f"{key}.mp4")
+    montage = os.path.join(TRANSCODE_DIR, f"{key}.jpg") if KEYFRAME_MONTAGE else None
+    os.makedirs(TRANSCODE_DIR, exist_ok=True)
+
+    with _lock_for(target):
+        if os.path.exists(target):
+            os.utime(target)
+        else:
+            try:
+                _run_to(lambda tmp: transcode_command(source, tmp), target)
+            except (OSError, subprocess.SubprocessError) as e:
+                return PreparedVideo(source, source_sha, error=f"transcode failed: {e}")
+            _evict()
+
+        if montage and not os.path.exists(montage):
+            duration = probe_duration(target)
+            try:
+                if not duration:
+                    raise ValueError("unknown duration")
+                _run_to(lambda tmp: montage_command(target, tmp, duration), montage)
+            except (OSError, ValueError, subprocess.SubprocessError):
+                montage = None
+
+    return PreparedVideo(target, key, transcoded=True, montage_path=montage)
@@ -1,49 +1,28 @@
 """Tool that uses Gemini to analyze a demo video."""
 
+import asyncio
+import hashlib
 import os
+import random
+import threading
 import time
+from concurrent.futures import Future
 from typing import Type
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from app.compaction import CompactionReport, compact_for
+from app.tools.result_cache import ResultCache, file_sha256, remember_sha256
+from app.tools.video_preprocess import PreparedVideo, prepared_signature, preprocess_signature, preprocess_video
 
-class VideoAnalysisInput(BaseModel):
-    file_path: str = Field(..., description="Absolute path to the video file (mp4)")
-
-
-class VideoAnalysisTool(BaseTool):
-    name: str = "Demo Video Analyzer"
-    description: str = (
-        "Uploads a demo video to Google Gemini and analyzes it for: "
-        "product functionality, UI quality, features demonstrated, "
-        "user flow completeness, and overall polish. "
-        "Returns a detailed text analysis."
-    )
-    args_schema: Type[BaseModel] = VideoAnalysisInput
-
-    def _run(self, file_path: str) -> str:
-        import google.generativeai as genai
+VIDEO_MODEL = os.getenv("GEMINI_VIDEO_MODEL", "gemini-2.0-flash")
+# Processing-state polls back off exponentially from the initial delay, with jitter.
+POLL_INITIAL_SECONDS = float(os.getenv("VIDEO_POLL_INITIAL_SECONDS", "0.5"))
+POLL_MAX_SECONDS = float(os.getenv("VIDEO_POLL_MAX_SECONDS", "8"))
+PROCESSING_TIMEOUT_SECONDS = float(os.getenv("VIDEO_PROCESSING_TIMEOUT_SECONDS", "600"))
 
-        api_key = os.getenv("GEMINI_API_KEY", "")
-        if not api_key:
-            return "Error: GEMINI_API_KEY environment variable is not set."
-
-        genai.configure(api_key=api_key)
-
-        try:
-            video_file = genai.upload_file(path=file_path)
-
-            while video_file.state.name == "PROCESSING":
-                time.sleep(3)
-                video_file = genai.get_file(video_file.name)
-
-            if video_file.state.name == "FAILED":
-                return f"Error: Video processing failed — {video_file.state.name}"
-
-            model = genai.GenerativeModel(model_name="gemini-2.0-flash")
-
-            prompt = """You are an expert hackathon judge analyzing a 2-minute product demo video.
+VIDEO_PROMPT = """You are an expert hackathon judge analyzing a 2-minute product demo video.
 
 Provide a comprehensive analysis covering:
 
@@ -77,7 +56,196 @@ Provide a comprehensive analysis covering:
 
 Be specific and reference exact moments or visual evidence when possible."""
 
-            response = model.generate_content([video_file, prompt])
+PROMPT_HASH = hashlib.sha256(VIDEO_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+_analysis_cache = ResultCache(
+    "video",
+    max_bytes=int(os.getenv("VIDEO_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    max_age=float(os.getenv("VIDEO_CACHE_MAX_AGE", str(30 * 24 * 3600))),
+)
+# Gemini deletes uploaded files 48 hours after upload; forget handles a little sooner,
+# counting from the upload rather than the last lookup.
+_remote_files = ResultCache("gemini_files", max_bytes=4 * 1024 * 1024, max_age=46 * 3600, refresh_on_read=False)
+
+# Uploads started ahead of the Video agent's turn, keyed by video SHA-256.
+_inflight_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+
+
+def _cache_key(video_sha: str, media: str | None = None, model: str = VIDEO_MODEL) -> str:
+    """Key for a cached analysis.
+
+    Lookups leave ``media`` unset, meaning what preprocessing would produce now.
+    Stores pass ``prepared_signature`` of what was actually sent, so analysing
+    the original after a failed transcode is never served as the transcode's.
+    """
+    return f"{video_sha}:{model}:{PROMPT_HASH}:{media or preprocess_signature()}"
+
+
+def cache_stats() -> dict:
+    return {"analyses": _analysis_cache.stats(), "remote_files": _remote_files.stats()}
+
+
+def _configured_genai():
+    api_key = os.getenv("GEMINI_API_KEY", "")
+    if not api_key:
+        return None
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai
+
+
+def _poll_delays(timeout: float = PROCESSING_TIMEOUT_SECONDS):
+    """Jittered, exponentially growing sleeps; raises TimeoutError once ``timeout`` is spent."""
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL_SECONDS
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Gemini was still processing the video after {timeout:.0f}s")
+        yield min(remaining, random.uniform(delay / 2, delay))
+        delay = min(delay * 2, POLL_MAX_SECONDS)
+
+
+def _lookup_remote(genai, upload_key: str):
+    """The previously uploaded Gemini file for ``upload_key``, if it is still usable."""
+    name = _remote_files.get(upload_key)
+    if not name:
+        return None
+    try:
+        video_file = genai.get_file(name)
+    except Exception:
+        return None
+    return None if video_file.state.name == "FAILED" else video_file
+
+
+def _upload(genai, prepared: PreparedVideo):
+    video_file = genai.upload_file(path=prepared.path)
+    _remote_files.put(prepared.key, video_file.name)
+    return video_file
+
+
+def _content_parts(video_file, prepared: PreparedVideo) -> list:
+    parts = [video_file]
+    if prepared.montage_path:
+        with open(prepared.montage_path, "rb") as f:
+            parts.append({"mime_type": "image/jpeg", "data": f.read()})
+        parts.append("The image above is a grid of evenly spaced frames from the same demo, in reading order.")
+    parts.append(VIDEO_PROMPT)
+    return parts
+
+
+def _wait_processed(genai, video_file):
+    delays = _poll_delays()
+    while video_file.state.name == "PROCESSING":
+        time.sleep(next(delays))
+        video_file = genai.get_file(video_file.name)
+    return video_file
+
+
+async def _wait_processed_async(genai, video_file):
+    delays = _poll_delays()
+    while video_file.state.name == "PROCESSING":
+        await asyncio.sleep(next(delays))
+        video_file = await asyncio.to_thread(genai.get_file, video_file.name)
+    return video_file
+
+
+async def _prepare_async(genai, file_path: str, video_sha: str):
+    prepared = await asyncio.to_thread(preprocess_video, file_path, video_sha)
+    video_file = await asyncio.to_thread(_lookup_remote, genai, prepared.key)
+    if video_file is None:
+        video_file = await asyncio.to_thread(_upload, genai, prepared)
+    return await _wait_processed_async(genai, video_file)
+
+
+def _inflight_upload(video_sha: str) -> Future | None:
+    with _inflight_lock:
+        return _inflight.get(video_sha)
+
+
+def start_upload(file_path: str, video_sha: str, loop: asyncio.AbstractEventLoop) -> Future | None:
+    """Start uploading ``file_path`` to Gemini on ``loop`` right away.
+
+    Gemini-side processing then overlaps with the other witnesses, and the
+    Video agent picks up the ready file instead of uploading it itself.
+    Does nothing if the analysis is already cached or no API key is set.
+    """
+    if _cache_key(video_sha) in _analysis_cache:
+        return None
+    genai = _configured_genai()
+    if genai is None:
+        return None
+    remember_sha256(file_path, video_sha)
+    with _inflight_lock:
+        future = _inflight.get(video_sha)
+        if future is not None:
+            return future
+        future = _inflight[video_sha] = asyncio.run_coroutine_threadsafe(
+            _prepare_async(genai, file_path, video_sha), loop
+        )
+
+    def _forget(done: Future):
+        with _inflight_lock:
+            if _inflight.get(video_sha) is done:
+                del _inflight[video_sha]
+
+    future.add_done_callback(_forget)
+    return future
+
+
+class VideoAnalysisInput(BaseModel):
+    file_path: str = Field(..., description="Absolute path to the video file (mp4)")
+
+
+class VideoAnalysisTool(BaseTool):
+    name: str = "Demo Video Analyzer"
+    description: str = (
+        "Uploads a demo video to Google Gemini and analyzes it for: "
+        "product functionality, UI quality, features demonstrated, "
+        "user flow completeness, and overall polish. "
+        "Returns a detailed text analysis."
+    )
+    args_schema: Type[BaseModel] = VideoAnalysisInput
+    compaction: CompactionReport | None = None
+
+    def _run(self, file_path: str) -> str:
+        return compact_for("video", "demo video analysis", self._analyze(file_path), self.compaction)
+
+    def _analyze(self, file_path: str) -> str:
+        genai = _configured_genai()
+        if genai is None:
+            return "Error: GEMINI_API_KEY environment variable is not set."
+
+        try:
+            video_sha = file_sha256(file_path)
+        except OSError as e:
+            return f"Error analyzing video: {str(e)}"
+        cached = _analysis_cache.get(_cache_key(video_sha))
+        if cached is not None:
+            return cached
+
+        try:
+            video_file = None
+            pending = _inflight_upload(video_sha)
+            if pending is not None:
+                try:
+                    video_file = pending.result(timeout=PROCESSING_TIMEOUT_SECONDS)
+                except Exception:
+                    video_file = None  # fall back to uploading here
+            # Already transcoded if the upload was prefetched; a cache lookup then.
+            prepared = preprocess_video(file_path, video_sha)
+            if video_file is None:
+                video_file = _lookup_remote(genai, prepared.key) or _upload(genai, prepared)
+                video_file = _wait_processed(genai, video_file)
+
+            if video_file.state.name == "FAILED":
+                return f"Error: Video processing failed — {video_file.state.name}"
+
+            model = genai.GenerativeModel(model_name=VIDEO_MODEL)
+            response = model.generate_content(_content_parts(video_file, prepared))
+            _analysis_cache.put(_cache_key(video_sha, prepared_signature(prepared)), response.text)
             return response.text
 
         except Exception as e:
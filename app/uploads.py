@@ -0,0 +1,237 @@
+"""Content-addressed storage of uploaded pitch decks and demo videos.
+
+Every unique upload is stored once under ``BLOB_DIR`` as
+``<sha[:2]>/<sha><suffix>``. Each submission writes a small manifest under
+``SUBMISSION_DIR`` naming the blobs it uses; ``UploadStore.gc`` deletes blobs
+no manifest references.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import BinaryIO
+
+from starlette.exceptions import HTTPException
+from starlette.responses import PlainTextResponse
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+BLOB_DIR = os.path.join(UPLOAD_DIR, "blobs")
+SUBMISSION_DIR = os.path.join(UPLOAD_DIR, "submissions")
+UPLOAD_CHUNK_BYTES = int(os.getenv("JUDGE_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+MAX_PPTX_BYTES = int(os.getenv("JUDGE_MAX_PPTX_BYTES", str(100 * 1024 * 1024)))
+MAX_VIDEO_BYTES = int(os.getenv("JUDGE_MAX_VIDEO_BYTES", str(2 * 1024 * 1024 * 1024)))
+# Whole request bodies over this are refused before form parsing spools them to disk.
+MAX_REQUEST_BYTES = int(
+    os.getenv("JUDGE_MAX_REQUEST_BYTES", str(MAX_PPTX_BYTES + MAX_VIDEO_BYTES + 1024 * 1024))
+)
+# Submission manifests older than this stop pinning their blobs.
+SUBMISSION_RETENTION_SECONDS = float(os.getenv("JUDGE_SUBMISSION_RETENTION_SECONDS", str(30 * 24 * 3600)))
+# Unreferenced blobs younger than this survive GC, covering uploads whose manifest isn't written yet.
+BLOB_GRACE_SECONDS = float(os.getenv("JUDGE_BLOB_GRACE_SECONDS", "3600"))
+GC_INTERVAL_SECONDS = float(os.getenv("JUDGE_UPLOAD_GC_INTERVAL_SECONDS", "3600"))
+
+
+class UploadTooLargeError(Exception):
+    """Raised mid-copy once an upload exceeds its size limit."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit / (1024 * 1024):.1f} MiB limit")
+        self.limit = limit
+
+
+@dataclass(frozen=True)
+class SavedUpload:
+    path: str
+    sha256: str
+    size: int
+    filename: str = ""
+    deduplicated: bool = False
+
+
+def stream_to_disk(source: BinaryIO, path: str, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_BYTES) -> SavedUpload:
+    """Copy ``source`` to ``path`` one chunk at a time, hashing as it goes.
+
+    Memory use is bounded by ``chunk_size`` whatever the upload size. The
+    data lands in a temp file that is renamed into place only once complete,
+    and is removed if the copy fails or ``max_bytes`` is exceeded. Blocking;
+    call it from a worker thread.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    tmp = f"{path}.part"
+    try:
+        with open(tmp, "wb") as f:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return SavedUpload(path=path, sha256=digest.hexdigest(), size=size)
+
+
+class UploadStore:
+    """Deduplicating blob store plus the submission manifests that pin its blobs."""
+
+    def __init__(self, blob_dir: str = BLOB_DIR, submission_dir: str = SUBMISSION_DIR):
+        self.blob_dir = blob_dir
+        self.submission_dir = submission_dir
+        self.deduplicated = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def blob_path(self, sha256: str, suffix: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}{suffix.lower()}")
+
+    def save(self, source: BinaryIO, suffix: str, max_bytes: int, filename: str = "") -> SavedUpload:
+        """Store ``source`` unless an identical blob already exists. Blocking.
+
+        The upload is hashed while it is copied to a staging file, so it is
+        read once; if the blob already exists the staging copy is dropped.
+        """
+        staging = os.path.join(self.blob_dir, "staging", f"{uuid.uuid4().hex}{suffix.lower()}")
+        saved = stream_to_disk(source, staging, max_bytes)
+        path = self.blob_path(saved.sha256, suffix)
+        if os.path.exists(path):
+            os.remove(saved.path)
+            os.utime(path)
+            with self._lock:
+                self.deduplicated += 1
+                self.bytes_saved += saved.size
+            return SavedUpload(path, saved.sha256, saved.size, filename, deduplicated=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(saved.path, path)
+        return SavedUpload(path, saved.sha256, saved.size, filename)
+
+    def record_submission(self, team_name: str, uploads: dict[str, SavedUpload]) -> str:
+        """Write the manifest tying a submission to its blobs; returns its path."""
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in team_name)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(self.submission_dir, f"{safe_name}_{timestamp}.json")
+        os.makedirs(self.submission_dir, exist_ok=True)
+        record = {
+            "team_name": team_name,
+            "created_at": datetime.now().isoformat(),
+            "files": {kind: asdict(upload) for kind, upload in uploads.items()},
+        }
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+        self.maybe_gc()
+        return path
+
+    def referenced(self) -> set[str]:
+        """Hashes pinned by live manifests; expired manifests are deleted on the way."""
+        now = time.time()
+        pinned: set[str] = set()
+        try:
+            names = [n for n in os.listdir(self.submission_dir) if n.endswith(".json")]
+        except OSError:
+            return pinned
+        for name in names:
+            path = os.path.join(self.submission_dir, name)
+            try:
+                if now - os.path.getmtime(path) > SUBMISSION_RETENTION_SECONDS:
+                    os.remove(path)
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pinned.update(upload["sha256"] for upload in record.get("files", {}).values())
+        return pinned
+
+    def gc(self) -> dict:
+        """Delete blobs that no live manifest references, once past the grace period."""
+        with self._lock:
+            self._last_gc = time.time()
+        pinned = self.referenced()
+        now = time.time()
+        removed = freed = 0
+        for root, _, names in os.walk(self.blob_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if name.split(".", 1)[0] in pinned or now - st.st_mtime < BLOB_GRACE_SECONDS:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                removed += 1
+                freed += st.st_size
+        return {"removed_blobs": removed, "freed_bytes": freed, "referenced_blobs": len(pinned)}
+
+    def maybe_gc(self):
+        if time.time() - self._last_gc > GC_INTERVAL_SECONDS:
+            self.gc()
+
+    def stats(self) -> dict:
+        blobs = size = 0
+        for root, _, names in os.walk(self.blob_dir):
+            if os.path.basename(root) == "staging":
+                continue
+            for name in names:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                    blobs += 1
+                except OSError:
+                    pass
+        return {"blobs": blobs, "bytes": size, "deduplicated": self.deduplicated, "bytes_saved": self.bytes_saved}
+
+
+class RequestSizeLimitMiddleware:
+    """ASGI middleware that refuses request bodies over ``max_bytes`` with 413.
+
+    A declared ``Content-Length`` over the limit is refused before any of the
+    body is read. Bodies without one (chunked) are counted as they arrive and
+    cut off once they pass the limit, so form parsing never spools more than
+    ``max_bytes`` to disk.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        detail = f"Request body exceeds the {self.max_bytes / (1024 * 1024):.1f} MiB limit"
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            await PlainTextResponse(detail, status_code=413, headers={"Connection": "close"})(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+upload_store = UploadStore()
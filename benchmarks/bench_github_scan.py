@@ -0,0 +1,89 @@
+"""Benchmark serial vs. pooled file scanning in GitHubAnalysisTool.
+
+Builds a synthetic repository (default 20,000 files) in a temp dir, commits it,
+and times both scan modes at several worker counts. Every run must produce the
+same RepoScan as the serial one, and both modes must agree with each other.
+
+    python -m benchmarks.bench_github_scan --files 20000 --workers 1 4 8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+import git
+
+from app.tools.github_tool import _scan_objects, _scan_worktree
+
+EXTENSIONS = [".py", ".js", ".ts", ".json", ".md", ".css", ".html", ".txt"]
+
+
+def build_tree(root: str, n_files: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n_files):
+        sub = os.path.join(root, f"pkg{i % 200}", f"mod{i % 17}")
+        os.makedirs(sub, exist_ok=True)
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        lines = rng.randint(5, 400)
+        with open(os.path.join(sub, f"file{i}{ext}"), "w") as f:
+            f.writelines(f"line {j} of file {i} {'x' * rng.randint(0, 80)}\n" for j in range(lines))
+        if i % 50 == 0:
+            # Binaries and symlinks, where the two modes are easiest to get out of step.
+            with open(os.path.join(sub, f"asset{i}.png"), "wb") as f:
+                f.write(b"\x89PNG\r\n\x1a\n\0" + rng.randbytes(rng.randint(100, 4000)))
+            os.symlink(f"asset{i}.png", os.path.join(sub, f"alias{i}.png"))
+    with open(os.path.join(root, "README.md"), "w") as f:
+        f.write("# Synthetic benchmark repo\n")
+    subprocess.run(["git", "init", "-q", root], check=True)
+    subprocess.run(["git", "-C", root, "add", "-A"], check=True)
+    subprocess.run(
+        ["git", "-C", root, "-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-qm", "synthetic"],
+        check=True,
+    )
+    # Mirrors fetched from a remote are packed; loose objects would understate the objects mode.
+    subprocess.run(["git", "-C", root, "repack", "-adq"], check=True)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_scan_")
+    try:
+        print(f"Building synthetic repo with {args.files} files in {root} ...")
+        build_tree(root, args.files)
+        repo = git.Repo(root)
+        rev = repo.head.commit.hexsha
+
+        print(f"{'mode':<10}{'workers':>8}{'seconds':>10}{'speedup':>9}")
+        baselines = []
+        for mode, scan_fn in (("worktree", lambda w: _scan_worktree(root, w)), ("objects", lambda w: _scan_objects(repo, rev, w))):
+            baseline, base_t = None, None
+            for workers in args.workers:
+                scan, elapsed = _timed(lambda: scan_fn(workers))
+                if baseline is None:
+                    baseline, base_t = scan, elapsed
+                elif scan != baseline:
+                    raise SystemExit(f"{mode} scan with {workers} workers differs from the serial result")
+                print(f"{mode:<10}{workers:>8}{elapsed:>10.3f}{base_t / elapsed:>8.2f}x")
+            baselines.append(baseline)
+        if baselines[0] != baselines[1]:
+            raise SystemExit("worktree and objects scans differ")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark python-pptx vs. zip/XML slide extraction in PPTXAnalysisTool.
+
+Generates an appendix-heavy deck (default 200 slides, each with a title,
+body text, a table, a picture and speaker notes) with python-pptx, then
+times the python-pptx reference path and the XML reader over several
+repeats. The XML reader must produce the same text as python-pptx.
+
+    python -m benchmarks.bench_pptx_extract --slides 200 --repeat 5
+"""
+
+import argparse
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from app.tools.pptx_extract import extract_deck
+from app.tools.pptx_tool import extract_with_python_pptx
+
+
+def build_deck(path: str, n_slides: int, table_rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    image = io.BytesIO()
+    Image.new("RGB", (64, 36), "steelblue").save(image, "PNG")
+    prs = Presentation()
+    for i in range(n_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Appendix {i}: metric breakdown"
+        body = slide.shapes.add_textbox(Inches(0.5), Inches(1.3), Inches(9), Inches(1)).text_frame
+        body.text = " ".join(f"word{rng.randint(0, 999)}" for _ in range(40))
+        for _ in range(3):
+            body.add_paragraph().text = f"- bullet {rng.randint(0, 10**6)}"
+        table = slide.shapes.add_table(table_rows, 5, Inches(0.5), Inches(2.5), Inches(9), Inches(4)).table
+        for r in range(table_rows):
+            for c in range(5):
+                table.cell(r, c).text = f"{rng.random() * 1000:.2f}" if r else f"Column {c}"
+        image.seek(0)
+        slide.shapes.add_picture(image, Inches(8), Inches(0.2))
+        slide.notes_slide.notes_text_frame.text = f"Speaker notes for slide {i}. " * 8
+    prs.save(path)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--table-rows", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_pptx_")
+    try:
+        path = os.path.join(root, "deck.pptx")
+        print(f"Building {args.slides}-slide deck in {root} ...")
+        build_deck(path, args.slides, args.table_rows)
+        print(f"Deck size: {os.path.getsize(path) / (1024 * 1024):.1f} MiB")
+
+        runs = [_timed(lambda: extract_with_python_pptx(path)) for _ in range(args.repeat)]
+        baseline, base_t = runs[0][0], min(t for _, t in runs)
+        runs = [_timed(lambda: extract_deck(path)) for _ in range(args.repeat)]
+        if any(text != baseline for text, _ in runs):
+            raise SystemExit("XML extraction differs from python-pptx")
+        elapsed = min(t for _, t in runs)
+        print(f"{'engine':<12}{'best of':>8}{'seconds':>10}{'speedup':>9}")
+        print(f"{'python-pptx':<12}{args.repeat:>8}{base_t:>10.3f}{1:>8.2f}x")
+        print(f"{'zip':<12}{args.repeat:>8}{elapsed:>10.3f}{base_t / elapsed:>8.2f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,8 +27,9 @@ const PATHS = [
   { from: "orchestrator", to: "output", d: "M 725,175 L 860,175" },
 ];
 
-function getPathState(from, to, activeAgents, completedAgents) {
+function getPathState(from, to, activeAgents, completedAgents, skippedAgents) {
   const activeSet = activeAgents instanceof Set ? activeAgents : new Set();
+  if (from in skippedAgents || to in skippedAgents) return "idle";
   const isToComplete = to in completedAgents;
   const isToActive = activeSet.has(to);
   const isFromComplete = from === "input" || from in completedAgents;
@@ -41,7 +42,7 @@ function getPathState(from, to, activeAgents, completedAgents) {
 }
 
 export default function Pipeline({ judging }) {
-  const { activeAgents, completedAgents, events } = judging;
+  const { activeAgents, completedAgents, skippedAgents, events, queue } = judging;
   const [elapsed, setElapsed] = useState(0);
   const startRef = useRef(Date.now());
   const feedRef = useRef(null);
@@ -58,7 +59,7 @@ export default function Pipeline({ judging }) {
   }, [events]);
 
   const activeSet = activeAgents instanceof Set ? activeAgents : new Set();
-  const completedCount = Object.keys(completedAgents).length;
+  const completedCount = Object.keys(completedAgents).length + Object.keys(skippedAgents).length;
   const minutes = String(Math.floor(elapsed / 60)).padStart(2, "0");
   const seconds = String(elapsed % 60).padStart(2, "0");
 
@@ -86,7 +87,9 @@ export default function Pipeline({ judging }) {
                 <span className="animate-ping absolute inline-flex h-full w-full rounded-full bg-pipe-primary opacity-50" />
                 <span className="relative inline-flex rounded-full h-2 w-2 bg-pipe-primary" />
               </span>
-              <span className="text-xs text-pipe-primary font-medium">Processing</span>
+              <span className="text-xs text-pipe-primary font-medium">
+                {queue ? `Queued #${queue.position} · ~${Math.ceil(queue.estimated_wait_s / 60)} min` : "Processing"}
+              </span>
             </div>
             <div className="text-xs text-pipe-muted font-medium">
               {completedCount}/4 stages
@@ -101,7 +104,7 @@ export default function Pipeline({ judging }) {
           <div className="relative" style={{ aspectRatio: "1000 / 350" }}>
             <svg viewBox="0 0 1000 350" className="absolute inset-0 w-full h-full" fill="none">
               {PATHS.map((p, i) => (
-                <path key={i} d={p.d} className={`path-${getPathState(p.from, p.to, activeAgents, completedAgents)}`} />
+                <path key={i} d={p.d} className={`path-${getPathState(p.from, p.to, activeAgents, completedAgents, skippedAgents)}`} />
               ))}
             </svg>
 
@@ -111,14 +114,15 @@ export default function Pipeline({ judging }) {
               const meta = AGENTS[key];
               const isActive = activeSet.has(key) && !(key in completedAgents);
               const isComplete = key in completedAgents;
+              const isSkipped = key in skippedAgents;
               return (
                 <PipelineNode
                   key={key}
                   pos={NODE_POS[key]}
                   label={meta.label}
-                  sublabel={meta.desc}
+                  sublabel={isSkipped ? "Skipped — no input" : meta.desc}
                   icon={meta.icon}
-                  state={isComplete ? "complete" : isActive ? "active" : "idle"}
+                  state={isSkipped ? "skipped" : isComplete ? "complete" : isActive ? "active" : "idle"}
                   color={meta.color}
                   bg={meta.bg}
                 />
@@ -232,6 +236,26 @@ export default function Pipeline({ judging }) {
                 </motion.div>
               );
             })}
+            {Object.entries(skippedAgents).map(([key, reason]) => {
+              const meta = AGENTS[key];
+              if (!meta) return null;
+              return (
+                <motion.div
+                  key={`skipped-${key}`}
+                  initial={{ opacity: 0, y: 10, scale: 0.97 }}
+                  animate={{ opacity: 0.7, y: 0, scale: 1 }}
+                  transition={{ duration: 0.35 }}
+                  className="card p-3"
+                >
+                  <div className="flex items-center gap-2 mb-1.5">
+                    <span className="text-sm">{meta.icon}</span>
+                    <span className="text-xs font-semibold" style={{ color: meta.color }}>{meta.label}</span>
+                    <span className="ml-auto text-[10px] text-pipe-dim font-semibold">Skipped</span>
+                  </div>
+                  <p className="text-[11px] text-pipe-muted leading-relaxed line-clamp-3">{reason}</p>
+                </motion.div>
+              );
+            })}
           </AnimatePresence>
 
           {completedCount === 0 && (
@@ -255,17 +279,19 @@ function PipelineNode({ pos, label, sublabel, icon, state, color, bg }) {
   const borderStyle =
     state === "complete" ? { borderColor: "#22c55e" } :
     state === "active"   ? { borderColor: color } :
+    state === "skipped"  ? { borderColor: "#d1d5db", borderStyle: "dashed" } :
     { borderColor: "#e5e7eb" };
 
   const bgStyle =
     state === "complete" ? { background: "#f0fdf4" } :
     state === "active"   ? { background: bg } :
+    state === "skipped"  ? { background: "#f9fafb" } :
     { background: "#ffffff" };
 
   return (
     <motion.div
       initial={{ opacity: 0, scale: 0.85 }}
-      animate={{ opacity: 1, scale: 1 }}
+      animate={{ opacity: state === "skipped" ? 0.6 : 1, scale: 1 }}
       transition={{ duration: 0.35 }}
       className={`absolute rounded-lg border-2 flex items-center gap-2 px-2.5 shadow-card ${state === "active" ? "node-active" : state === "complete" ? "node-complete" : ""}`}
       style={{ left, top, width, height, ...borderStyle, ...bgStyle }}
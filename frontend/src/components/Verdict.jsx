@@ -277,6 +277,19 @@ function AgentReportsPanel({ analyses }) {
                 </div>
               )}
 
+              {analysis.claims?.length > 0 && (
+                <div>
+                  <h4 className="text-[10px] text-pipe-dim uppercase tracking-widest mb-1.5 font-bold">Claims</h4>
+                  <ul className="space-y-1">
+                    {analysis.claims.map((c, i) => (
+                      <li key={i} className="text-xs text-pipe-muted flex items-start gap-2">
+                        <span style={{ color }} className="mt-0.5">›</span>{c}
+                      </li>
+                    ))}
+                  </ul>
+                </div>
+              )}
+
               <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
                 {analysis.strengths?.length > 0 && (
                   <div className="rounded-lg bg-pipe-green-wash p-3">
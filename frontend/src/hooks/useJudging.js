@@ -8,8 +8,10 @@ export default function useJudging() {
   const [events, setEvents] = useState([]);
   const [activeAgents, setActiveAgents] = useState(new Set());
   const [completedAgents, setCompletedAgents] = useState({});
+  const [skippedAgents, setSkippedAgents] = useState({}); // agent -> reason, for witnesses with no input
   const [result, setResult] = useState(null);
   const [error, setError] = useState(null);
+  const [queue, setQueue] = useState(null); // { position, estimated_wait_s } while waiting for a slot
   const eventSourceRef = useRef(null);
 
   const submit = useCallback(async (formData) => {
@@ -17,8 +19,10 @@ export default function useJudging() {
     setEvents([]);
     setActiveAgents(new Set());
     setCompletedAgents({});
+    setSkippedAgents({});
     setResult(null);
     setError(null);
+    setQueue(null);
 
     try {
       const res = await fetch("/api/judge/start", {
@@ -26,6 +30,10 @@ export default function useJudging() {
         body: formData,
       });
 
+      if (res.status === 429) {
+        const retryAfter = res.headers.get("Retry-After");
+        throw new Error(`Judging queue is full — try again in ${retryAfter || "a few"} seconds`);
+      }
       if (!res.ok) {
         throw new Error(`Server error: ${res.status}`);
       }
@@ -43,10 +51,19 @@ export default function useJudging() {
           setEvents((prev) => [...prev, parsed]);
 
           switch (parsed.type) {
+            case "queued":
+              setQueue({ position: parsed.position, estimated_wait_s: parsed.estimated_wait_s });
+              break;
+
             case "agent_started":
+              setQueue(null);
               setActiveAgents((prev) => new Set([...prev, parsed.agent]));
               break;
 
+            case "agent_skipped":
+              setSkippedAgents((prev) => ({ ...prev, [parsed.agent]: parsed.reason || "Skipped" }));
+              break;
+
             case "agent_complete":
               setActiveAgents((prev) => {
                 const next = new Set(prev);
@@ -76,9 +93,13 @@ export default function useJudging() {
         }
       };
 
+      // EventSource reconnects on its own and sends Last-Event-ID, so the
+      // server resumes the stream without gaps. Only fall back to polling
+      // the result once the browser has given up.
       es.onerror = () => {
-        es.close();
-        fetchResult(data.job_id);
+        if (es.readyState === EventSource.CLOSED) {
+          fetchResult(data.job_id);
+        }
       };
     } catch (err) {
       setError(err.message);
@@ -108,8 +129,10 @@ export default function useJudging() {
     setEvents([]);
     setActiveAgents(new Set());
     setCompletedAgents({});
+    setSkippedAgents({});
     setResult(null);
     setError(null);
+    setQueue(null);
   }, []);
 
   return {
@@ -118,8 +141,10 @@ export default function useJudging() {
     events,
     activeAgents,
     completedAgents,
+    skippedAgents,
     result,
     error,
+    queue,
     submit,
     reset,
     agentOrder: AGENT_ORDER,
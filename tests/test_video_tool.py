@@ -0,0 +1,86 @@
+"""Offline checks for VideoAnalysisTool's caching, with Gemini and ffmpeg stubbed out."""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.tools import video_tool
+from app.tools.video_preprocess import PreparedVideo, settings_signature
+
+
+class FakeGenai:
+    """Just enough of ``google.generativeai`` for one upload and one generate call."""
+
+    def __init__(self):
+        self.uploads = []
+
+    def upload_file(self, path):
+        self.uploads.append(path)
+        return SimpleNamespace(name=f"files/{len(self.uploads)}", state=SimpleNamespace(name="ACTIVE"))
+
+    def get_file(self, name):
+        return SimpleNamespace(name=name, state=SimpleNamespace(name="ACTIVE"))
+
+    def GenerativeModel(self, model_name):
+        return SimpleNamespace(generate_content=lambda parts: SimpleNamespace(text="analysis"))
+
+
+@pytest.fixture
+def genai(monkeypatch, tmp_path):
+    fake = FakeGenai()
+    monkeypatch.setattr(video_tool, "_configured_genai", lambda: fake)
+    monkeypatch.setattr(video_tool._analysis_cache, "directory", str(tmp_path / "video"))
+    monkeypatch.setattr(video_tool._remote_files, "directory", str(tmp_path / "gemini_files"))
+    # Preprocessing is configured, so lookups expect a transcode.
+    monkeypatch.setattr(video_tool, "preprocess_signature", settings_signature)
+    return fake
+
+
+@pytest.fixture
+def demo(tmp_path):
+    path = tmp_path / "demo.mp4"
+    path.write_bytes(b"not really a video")
+    return str(path)
+
+
+@pytest.mark.parametrize("transcoded", [False, True])
+def test_analysis_is_cached_under_what_was_uploaded(genai, demo, monkeypatch, transcoded):
+    sha = video_tool.file_sha256(demo)
+    prepared = PreparedVideo(
+        path=demo,
+        key=f"{sha}:{settings_signature()}" if transcoded else sha,
+        transcoded=transcoded,
+        error=None if transcoded else "ffmpeg exited with status 1",
+    )
+    monkeypatch.setattr(video_tool, "preprocess_video", lambda path, video_sha: prepared)
+
+    assert video_tool.VideoAnalysisTool()._analyze(demo) == "analysis"
+    assert genai.uploads == [demo]
+
+    raw_key = video_tool._cache_key(sha, "raw")
+    transcode_key = video_tool._cache_key(sha)
+    assert transcode_key == video_tool._cache_key(sha, settings_signature())
+    if transcoded:
+        assert transcode_key in video_tool._analysis_cache
+        assert raw_key not in video_tool._analysis_cache
+    else:
+        # The original was analysed, so a later successful transcode must not reuse this result.
+        assert raw_key in video_tool._analysis_cache
+        assert transcode_key not in video_tool._analysis_cache
+
+
+def test_remote_file_handles_expire_by_upload_time(genai, demo, monkeypatch):
+    prepared = PreparedVideo(path=demo, key="upload-key")
+    uploaded = video_tool._upload(genai, prepared)
+    handle = video_tool._remote_files._path(prepared.key)
+
+    # Uploaded 45h ago: still usable, and reading it must not extend its life.
+    now = time.time()
+    os.utime(handle, (now - 45 * 3600, now - 45 * 3600))
+    assert video_tool._lookup_remote(genai, prepared.key).name == uploaded.name
+
+    # Two hours on, the handle is 47h old and Gemini may already have deleted the file.
+    monkeypatch.setattr(time, "time", lambda: now + 2 * 3600)
+    assert video_tool._lookup_remote(genai, prepared.key) is None